@@ -5,6 +5,11 @@ import json
 import tempfile
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 def load_export_session_state():
@@ -27,8 +32,17 @@ def load_export_session_state():
 
         if state_file.exists():
             try:
-                with open(state_file, 'r') as f:
-                    saved_state = json.load(f)
+                raw_state = state_file.read_bytes()
+                saved_state = None
+                if orjson is not None:
+                    try:
+                        saved_state = orjson.loads(raw_state)
+                    except orjson.JSONDecodeError:
+                        # The state is written by the stdlib encoder, which
+                        # emits NaN/Infinity; orjson rejects those
+                        pass
+                if saved_state is None:
+                    saved_state = json.loads(raw_state)
 
                 print(f"[EXPORT DEBUG] Loaded state with {len(saved_state)} keys")
                 print(f"[EXPORT DEBUG] Keys: {list(saved_state.keys())[:10]}...")
@@ -75,6 +89,16 @@ try:
 except Exception as e:
     print(f"Warmup initialization skipped: {e}")
 
+# Pre-launch the shared screenshot browser so the first export capture is hot.
+# Opt-in: it keeps a Chromium process resident for the lifetime of the server.
+if os.environ.get('SCREENSHOT_WARMUP') == 'true':
+    try:
+        from core.screenshot_service import warmup_screenshot_service
+        import threading
+        threading.Thread(target=warmup_screenshot_service, daemon=True).start()
+    except Exception as e:
+        print(f"Screenshot warmup skipped: {e}")
+
 def _render_partner_view():
     """Render only the Trailblazer component for partner users."""
     import streamlit.components.v1 as components
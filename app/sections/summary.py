@@ -15,9 +15,9 @@ def summary(percentile, scores, improvement_areas, brand_name, brief_text, indus
     
     with col1:
         # Resonance Convergence Coefficient - canonical RCC formula (MetricsService)
-        from core.services.metrics import MetricsService
+        from core.services.metrics import MetricsService, hash_brief
         rcc_score = MetricsService()._calculate_rcc_score(
-            scores, brief_text, sum(scores.values()) / len(scores)
+            scores, hash_brief(brief_text), sum(scores.values()) / len(scores)
         )
         st.markdown(f"""
         <div style="background: white; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.05); padding: 20px; text-align: center; min-height: 150px; display: flex; flex-direction: column; justify-content: center;">
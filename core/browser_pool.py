@@ -0,0 +1,128 @@
+"""
+Browser Pool - Persistent headless Chromium shared by every capture path.
+
+Playwright's sync API is bound to the thread that started it, so browsers
+can't be shared between threads. Captures run on one small persistent pool
+instead, and each pool thread keeps its own Chromium running between exports;
+only the BrowserContext is created per capture. Both core.streamlit_screenshot
+and core.screenshot_service submit their work here, so the process never holds
+more than CAPTURE_WORKERS idle browsers. Chromium exits with the Playwright
+driver when the process does.
+"""
+
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Number of capture threads, each owning one browser. Each one is a separate
+# Chromium process, so keep this small.
+CAPTURE_WORKERS = max(int(os.environ.get("SECTION_CAPTURE_WORKERS", "2")), 1)
+
+# Chromium flags for headless rendering in containers
+BROWSER_LAUNCH_ARGS = ['--disable-gpu', '--no-sandbox', '--disable-dev-shm-usage']
+
+_browser_local = threading.local()
+_pool_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def capture_pool() -> ThreadPoolExecutor:
+    """The executor every Playwright capture runs on, created on first use."""
+    global _executor
+    with _pool_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=CAPTURE_WORKERS,
+                thread_name_prefix="playwright-capture"
+            )
+        return _executor
+
+
+def get_browser():
+    """Headless Chromium for the calling pool thread, launched on first use."""
+    browser = getattr(_browser_local, 'browser', None)
+    if browser is not None and browser.is_connected():
+        return browser
+
+    from playwright.sync_api import sync_playwright
+
+    if getattr(_browser_local, 'playwright', None) is None:
+        _browser_local.playwright = sync_playwright().start()
+    logger.info("Launching headless Chromium browser...")
+    browser = _browser_local.browser = _browser_local.playwright.chromium.launch(
+        headless=True,
+        args=BROWSER_LAUNCH_ARGS
+    )
+    return browser
+
+
+@contextmanager
+def browser_context(viewport_width: int, viewport_height: int):
+    """New BrowserContext on the calling thread's browser, closed on exit."""
+    context = get_browser().new_context(
+        viewport={'width': viewport_width, 'height': viewport_height}
+    )
+    try:
+        yield context
+    finally:
+        context.close()
+
+
+def _close_thread_browser() -> None:
+    """Close the calling thread's browser and Playwright driver, if any."""
+    browser = getattr(_browser_local, 'browser', None)
+    playwright = getattr(_browser_local, 'playwright', None)
+    _browser_local.browser = _browser_local.playwright = None
+    if browser is not None:
+        try:
+            browser.close()
+        except Exception as e:
+            logger.debug(f"Error closing browser: {e}")
+    if playwright is not None:
+        playwright.stop()
+
+
+def run_on_every_worker(executor: ThreadPoolExecutor, fn: Callable[[], Any]) -> List[Any]:
+    """
+    Run fn once on each of the executor's threads and return the results.
+
+    A barrier holds every job until all of them have started, so no thread
+    can pick up two and each one gets exactly one.
+    """
+    workers = executor._max_workers
+    barrier = threading.Barrier(workers)
+
+    def on_worker():
+        barrier.wait()
+        return fn()
+
+    futures = [executor.submit(on_worker) for _ in range(workers)]
+    return [future.result() for future in futures]
+
+
+def warm_browsers() -> None:
+    """Launch the browser on every pool thread ahead of the first capture."""
+    run_on_every_worker(capture_pool(), get_browser)
+
+
+def reset_browser_pool() -> None:
+    """
+    Close every cached capture browser and the pool threads that own them.
+
+    The next capture starts a fresh pool and launches new browsers.
+    """
+    global _executor
+    with _pool_lock:
+        executor, _executor = _executor, None
+    if executor is None:
+        return
+
+    # Each browser can only be closed from its own thread
+    run_on_every_worker(executor, _close_thread_browser)
+    executor.shutdown(wait=True)
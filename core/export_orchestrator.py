@@ -902,7 +902,7 @@ class ExportOrchestrator:
         Args:
             prs: PowerPoint presentation object
             title: Slide title
-            image_bytes: PNG image bytes
+            image_bytes: PNG or JPEG image bytes
         """
         from PIL import Image
         import io
@@ -911,9 +911,11 @@ class ExportOrchestrator:
         self._set_white_background(slide)
         self._add_slide_title(slide, title)
 
-        # Load image to get dimensions
-        img = Image.open(io.BytesIO(image_bytes))
-        img_width, img_height = img.size
+        # Load image to get dimensions (PIL only reads the header here; the
+        # same in-memory stream is handed to python-pptx below)
+        image_stream = io.BytesIO(image_bytes)
+        with Image.open(image_stream) as img:
+            img_width, img_height = img.size
 
         # Calculate scaling to fit slide (leaving room for title)
         # Available area: 13.333" wide x 6.5" tall (after title)
@@ -934,7 +936,7 @@ class ExportOrchestrator:
         top = Inches(0.9)  # Below title
 
         # Add image to slide
-        image_stream = io.BytesIO(image_bytes)
+        image_stream.seek(0)
         slide.shapes.add_picture(image_stream, left, top, width=final_width, height=final_height)
 
         logger.info(f"  ✓ Added screenshot slide: {title} ({img_width}x{img_height}px)")
@@ -2,14 +2,16 @@
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MetricsData:
+    # scores is keyed by metric name; building it from
+    # core.services.metrics.METRIC_NAMES reuses the interned key objects
     scores: Dict[str, float]
     brief_text: str
     improvement_areas: List[str]
     ai_insights: Optional[Dict] = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RadarChartData:
     categories: List[str]
     values: List[float]
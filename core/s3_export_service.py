@@ -10,15 +10,33 @@ This service manages the full export pipeline:
 import os
 import uuid
 import json
+import time
 import logging
+import threading
 import requests
-from typing import Optional, Dict, Any, List, Callable
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, Any, List, Callable, Tuple
 from dataclasses import dataclass
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(name)s: %(message)s')
 
+# PPTX generation pulls in python-pptx and the screenshot stack; import once
+try:
+    from core.export_orchestrator import export_to_pptx, export_to_pptx_with_screenshots
+    EXPORT_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"PPTX export unavailable: {e}")
+    EXPORT_AVAILABLE = False
+
 # API Configuration
 API_BASE_URL = os.environ.get(
     'PPTX_EXPORT_API_URL',
@@ -26,11 +44,26 @@ API_BASE_URL = os.environ.get(
 )
 S3_BUCKET = os.environ.get('PPTX_EXPORT_BUCKET', 'ari-exports-prod')
 
-# Timeouts
+# Timeouts (read timeouts; connects fail fast on CONNECT_TIMEOUT)
+CONNECT_TIMEOUT = 5  # seconds
 PRESIGNED_URL_TIMEOUT = 30  # seconds
 UPLOAD_TIMEOUT = 120  # seconds (for large files)
 STITCH_TIMEOUT = 300  # seconds (Lambda can take up to 15 min)
 
+# Presigned URL caching
+PRESIGNED_URL_TTL = 900  # seconds, assumed when the API omits expiresIn
+PRESIGNED_URL_EXPIRY_MARGIN = 30  # seconds, drop cached URLs this early
+
+# Concurrent component uploads per export
+UPLOAD_WORKERS = 4
+
+
+def _json_body(payload: Dict[str, Any]) -> bytes:
+    """Encode an API request body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
 
 @dataclass
 class ExportResult:
@@ -59,6 +92,9 @@ class S3ExportService:
             # Use result.download_url
     """
 
+    # Components every stitch must include, prepended when missing
+    _REQUIRED_COMPONENTS = ('streamlit_complete',)
+
     # Default slide order for stitching
     DEFAULT_SLIDE_ORDER = [
         'streamlit_complete',
@@ -85,16 +121,70 @@ class S3ExportService:
         self.bucket = bucket
         self.session = requests.Session()
 
+        # (action, export_id, component_name) -> (url, monotonic expiry)
+        self._url_cache: Dict[Tuple[str, str, str], Tuple[str, float]] = {}
+        self._url_cache_lock = threading.Lock()
+
+        # Retry transient API Gateway and S3 failures at the transport layer.
+        # This session only sends the presigned-URL POSTs, which just sign a
+        # URL and are safe to replay, and the S3 PUTs, which overwrite the
+        # same key, so both are retried on 429/5xx and read errors.
+        retry = Retry(
+            total=5,
+            connect=3,
+            read=2,
+            status=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET', 'POST', 'PUT'],
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            max_retries=retry,
+            pool_connections=8,
+            pool_maxsize=16
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
         # Set default headers
         self.session.headers.update({
             'Content-Type': 'application/json',
             'Accept': 'application/json'
         })
 
+        # Stitch is not idempotent: API Gateway answers 504 after ~29s while
+        # the Lambda keeps running, so a retry would start a second stitch.
+        # It gets its own session with no retrying adapter.
+        self._stitch_session = requests.Session()
+        self._stitch_session.headers.update(self.session.headers)
+
     def generate_export_id(self) -> str:
         """Generate a unique export ID."""
         return str(uuid.uuid4())
 
+    def _get_cached_url(self, key: Tuple[str, str, str]) -> Optional[str]:
+        """Return a cached presigned URL if it is still comfortably valid."""
+        with self._url_cache_lock:
+            entry = self._url_cache.get(key)
+            if entry is None:
+                return None
+            url, expiry = entry
+            if time.monotonic() < expiry:
+                return url
+            del self._url_cache[key]
+            return None
+
+    def _cache_url(self, key: Tuple[str, str, str], url: str, data: Dict[str, Any]):
+        """Cache a presigned URL until shortly before its signature expires."""
+        try:
+            ttl = float(data.get('expiresIn', PRESIGNED_URL_TTL))
+        except (TypeError, ValueError):
+            ttl = PRESIGNED_URL_TTL
+        expiry = time.monotonic() + ttl - PRESIGNED_URL_EXPIRY_MARGIN
+        with self._url_cache_lock:
+            self._url_cache[key] = (url, expiry)
+
     def get_presigned_upload_url(
         self,
         export_id: str,
@@ -110,16 +200,21 @@ class S3ExportService:
         Returns:
             Presigned URL for PUT operation, or None if failed
         """
+        cache_key = ('upload', export_id, component_name)
+        cached_url = self._get_cached_url(cache_key)
+        if cached_url:
+            return cached_url
+
         try:
             response = self.session.post(
                 f"{self.api_base_url}/presigned-url",
-                json={
+                data=_json_body({
                     'action': 'upload',
                     'exportId': export_id,
                     'componentName': component_name,
                     'bucket': self.bucket
-                },
-                timeout=PRESIGNED_URL_TIMEOUT
+                }),
+                timeout=(CONNECT_TIMEOUT, PRESIGNED_URL_TIMEOUT)
             )
             response.raise_for_status()
 
@@ -128,6 +223,7 @@ class S3ExportService:
 
             if url:
                 logger.info(f"Got presigned URL for {component_name}")
+                self._cache_url(cache_key, url, data)
                 return url
             else:
                 logger.error(f"No URL in response: {data}")
@@ -155,14 +251,15 @@ class S3ExportService:
             True if upload succeeded, False otherwise
         """
         try:
-            # Use a separate session for S3 upload (different headers)
-            response = requests.put(
+            # Sent through the retrying session; the per-request
+            # Content-Type overrides the session's JSON default
+            response = self.session.put(
                 presigned_url,
                 data=pptx_bytes,
                 headers={
                     'Content-Type': content_type
                 },
-                timeout=UPLOAD_TIMEOUT
+                timeout=(CONNECT_TIMEOUT, UPLOAD_TIMEOUT)
             )
             response.raise_for_status()
 
@@ -191,15 +288,15 @@ class S3ExportService:
             Dict with 'downloadUrl', 's3Key', 'componentsIncluded' or None if failed
         """
         try:
-            response = self.session.post(
+            response = self._stitch_session.post(
                 f"{self.api_base_url}/stitch",
-                json={
+                data=_json_body({
                     'exportId': export_id,
                     'bucket': self.bucket,
                     'components': components,
                     'slideOrder': slide_order or self.DEFAULT_SLIDE_ORDER
-                },
-                timeout=STITCH_TIMEOUT
+                }),
+                timeout=(CONNECT_TIMEOUT, STITCH_TIMEOUT)
             )
             response.raise_for_status()
 
@@ -227,7 +324,8 @@ class S3ExportService:
         export_id: Optional[str] = None,
         use_screenshots: bool = False,
         app_url: str = "http://localhost:3006",
-        include_sections: Optional[Dict[str, bool]] = None
+        include_sections: Optional[Dict[str, bool]] = None,
+        component_files: Optional[Dict[str, bytes]] = None
     ) -> ExportResult:
         """
         Complete export pipeline: generate PPTX, upload to S3, stitch, return URL.
@@ -246,6 +344,9 @@ class S3ExportService:
             use_screenshots: If True, capture actual UI screenshots instead of programmatic generation
             app_url: URL of the running Streamlit app (for screenshot mode)
             include_sections: Dict of section names to include (True) or exclude (False)
+            component_files: Optional extra component PPTX bytes by component name.
+                             They are uploaded alongside streamlit_complete, all
+                             concurrently, and added to the stitch.
 
         Returns:
             ExportResult with success status and download URL or error
@@ -261,12 +362,14 @@ class S3ExportService:
         logger.info(f"Screenshot mode: {use_screenshots}, App URL: {app_url}")
 
         try:
+            if not EXPORT_AVAILABLE:
+                raise ImportError("PPTX export dependencies are not installed")
+
             # Step 1: Generate PPTX
             update_progress(10, "Generating presentation...")
 
             if use_screenshots:
                 logger.info("Generating PPTX with screenshots...")
-                from core.export_orchestrator import export_to_pptx_with_screenshots
                 pptx_bytes = export_to_pptx_with_screenshots(
                     session_state=session_state,
                     brand_name=brand_name,
@@ -278,7 +381,6 @@ class S3ExportService:
                 )
             else:
                 logger.info("Generating PPTX programmatically...")
-                from core.export_orchestrator import export_to_pptx
                 pptx_bytes = export_to_pptx(
                     session_state=session_state,
                     brand_name=brand_name,
@@ -289,37 +391,32 @@ class S3ExportService:
 
             logger.info(f"Generated PPTX: {len(pptx_bytes):,} bytes")
 
-            # Step 2: Get presigned upload URL
-            update_progress(45, "Preparing upload...")
-            logger.info("Getting presigned URL...")
+            # Step 2: Upload streamlit_complete and any extra components.
+            # All uploads finish before the single stitch call below.
+            update_progress(45, "Uploading to cloud...")
+            uploads = dict(component_files or {})
+            uploads['streamlit_complete'] = pptx_bytes
+            logger.info(f"Uploading {len(uploads)} component(s) to S3...")
 
-            presigned_url = self.get_presigned_upload_url(export_id, 'streamlit_complete')
-            if not presigned_url:
+            failed = [name for name, ok in self.upload_components(export_id, uploads).items() if not ok]
+            if failed:
                 return ExportResult(
                     success=False,
                     export_id=export_id,
-                    error="Failed to get presigned upload URL"
+                    error=f"Failed to upload {', '.join(failed)} to S3"
                 )
 
-            # Step 3: Upload to S3
-            update_progress(55, "Uploading to cloud...")
-            logger.info("Uploading to S3...")
-
-            if not self.upload_to_s3(presigned_url, pptx_bytes):
-                return ExportResult(
-                    success=False,
-                    export_id=export_id,
-                    error="Failed to upload PPTX to S3"
-                )
-
-            # Step 4: Invoke stitch Lambda
+            # Step 3: Invoke stitch Lambda
             update_progress(75, "Assembling final presentation...")
             logger.info("Invoking stitch Lambda...")
 
             # Include streamlit_complete plus any other specified components
-            stitch_components = components or ['streamlit_complete']
-            if 'streamlit_complete' not in stitch_components:
-                stitch_components = ['streamlit_complete'] + stitch_components
+            requested = tuple(components) if components else self._REQUIRED_COMPONENTS
+            requested_set = frozenset(requested)
+            missing = [c for c in self._REQUIRED_COMPONENTS if c not in requested_set]
+            stitch_components = missing + list(requested)
+            # Every component uploaded above is stitched too
+            stitch_components += [c for c in uploads if c not in requested_set and c not in missing]
 
             stitch_result = self.invoke_stitch(
                 export_id=export_id,
@@ -378,6 +475,35 @@ class S3ExportService:
 
         return self.upload_to_s3(presigned_url, pptx_bytes)
 
+    def upload_components(
+        self,
+        export_id: str,
+        components: Dict[str, bytes]
+    ) -> Dict[str, bool]:
+        """
+        Upload several component PPTX files to S3 concurrently.
+
+        Args:
+            export_id: Export session ID (must match other components)
+            components: Mapping of component name to raw PPTX bytes
+
+        Returns:
+            Mapping of component name to whether its upload succeeded
+        """
+        if len(components) <= 1:
+            return {
+                name: self.upload_component(export_id, name, pptx_bytes)
+                for name, pptx_bytes in components.items()
+            }
+
+        workers = min(len(components), UPLOAD_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='s3-upload') as executor:
+            futures = {
+                name: executor.submit(self.upload_component, export_id, name, pptx_bytes)
+                for name, pptx_bytes in components.items()
+            }
+            return {name: future.result() for name, future in futures.items()}
+
     def get_download_url(
         self,
         export_id: str,
@@ -393,21 +519,29 @@ class S3ExportService:
         Returns:
             Presigned download URL or None
         """
+        cache_key = ('download', export_id, component_name)
+        cached_url = self._get_cached_url(cache_key)
+        if cached_url:
+            return cached_url
+
         try:
             response = self.session.post(
                 f"{self.api_base_url}/presigned-url",
-                json={
+                data=_json_body({
                     'action': 'download',
                     'exportId': export_id,
                     'componentName': component_name,
                     'bucket': self.bucket
-                },
-                timeout=PRESIGNED_URL_TIMEOUT
+                }),
+                timeout=(CONNECT_TIMEOUT, PRESIGNED_URL_TIMEOUT)
             )
             response.raise_for_status()
 
             data = response.json()
-            return data.get('url')
+            url = data.get('url')
+            if url:
+                self._cache_url(cache_key, url, data)
+            return url
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to get download URL: {e}")
@@ -424,7 +558,8 @@ def export_to_s3_and_stitch(
     export_id: Optional[str] = None,
     use_screenshots: bool = False,
     app_url: str = "http://localhost:3006",
-    include_sections: Optional[Dict[str, bool]] = None
+    include_sections: Optional[Dict[str, bool]] = None,
+    component_files: Optional[Dict[str, bytes]] = None
 ) -> ExportResult:
     """
     Convenience function for the complete export pipeline.
@@ -439,6 +574,7 @@ def export_to_s3_and_stitch(
         use_screenshots: If True, capture actual UI screenshots instead of programmatic generation
         app_url: URL of the running Streamlit app (for screenshot mode)
         include_sections: Dict of section names to include (True) or exclude (False)
+        component_files: Optional extra component PPTX bytes to upload and stitch
 
     Returns:
         ExportResult with download URL or error
@@ -453,7 +589,8 @@ def export_to_s3_and_stitch(
         export_id=export_id,
         use_screenshots=use_screenshots,
         app_url=app_url,
-        include_sections=include_sections
+        include_sections=include_sections,
+        component_files=component_files
     )
 
 
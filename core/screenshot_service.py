@@ -4,35 +4,181 @@ Replaced cloud-based services (Browserless, ScreenshotAPI) with local Playwright
 """
 
 import os
+import re
 import json
+import time
 import logging
-from typing import Optional, Dict, Any
-from io import BytesIO
+import tempfile
+import threading
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
+
+from core.browser_pool import (
+    BROWSER_LAUNCH_ARGS, capture_pool, get_browser, reset_browser_pool, run_on_every_worker
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from playwright.sync_api import sync_playwright
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    sync_playwright = None
+    PLAYWRIGHT_AVAILABLE = False
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Screenshot encoding: "png" (default) or "jpeg", from the same env var as
+# core/streamlit_screenshot. JPEG is far cheaper to encode for slide-sized
+# captures; callers opt in per call or set SCREENSHOT_FORMAT=jpeg.
+SCREENSHOT_FORMAT = os.environ.get("SCREENSHOT_FORMAT", "png").lower()
+SCREENSHOT_QUALITY = 85
+
+# Set on <body> by the export script on window load. That is before React has
+# finished rendering, so readiness also waits for the DOM to go idle.
+EXPORT_READY_SELECTOR = 'body[data-export-mode="true"]'
+
+# Injected before </head> so components can detect export rendering
+EXPORT_MODE_SCRIPT = """
+    <script>
+        window.EXPORT_MODE = true;
+        window.addEventListener('load', function() {
+            document.body.setAttribute('data-export-mode', 'true');
+        });
+    </script>
+    """
+
+# HTML larger than this is loaded from a temp file instead of pushed over CDP
+HTML_FILE_THRESHOLD = 256 * 1024
+
+# Template placeholders look like {{NAME}}. Any key without braces matches
+# (hyphens, dots and spaces included), as with the old str.replace loop;
+# keys missing from the replacements are left untouched.
+_PLACEHOLDER_RE = re.compile(r'\{\{([^{}]+)\}\}')
+
+# Resolves true once the DOM has gone idleMs without a mutation, false after
+# timeoutMs. Same wait as _wait_for_dom_idle in core/streamlit_screenshot.
+DOM_IDLE_JS = '''([idleMs, timeoutMs]) => new Promise(resolve => {
+    let idleTimer;
+    const finish = settled => {
+        observer.disconnect();
+        clearTimeout(idleTimer);
+        clearTimeout(deadline);
+        resolve(settled);
+    };
+    const observer = new MutationObserver(() => {
+        clearTimeout(idleTimer);
+        idleTimer = setTimeout(() => finish(true), idleMs);
+    });
+    observer.observe(document.body, {childList: true, subtree: true, attributes: true, characterData: true});
+    idleTimer = setTimeout(() => finish(true), idleMs);
+    const deadline = setTimeout(() => finish(false), timeoutMs);
+})'''
+
+# Quiet period that counts as "rendered" for DOM_IDLE_JS; long enough to span
+# the gaps between chart animation frames that mutate SVG attributes
+DOM_IDLE_MS = 300
+
+# Resolves after two animation frames, i.e. once pending React commits have painted
+RENDER_SETTLED_JS = '() => new Promise(r => requestAnimationFrame(() => requestAnimationFrame(() => r(true))))'
+
 
 class PlaywrightScreenshotService:
     """
     Screenshot service using local Playwright installation.
 
+    The Chromium process is launched on first use and reused for later
+    captures; each capture only creates its own BrowserContext. Playwright's
+    sync API is bound to the thread that started it, so an instance must be
+    used from a single thread.
+
+    With use_shared_browser, captures instead use the calling thread's browser
+    from core.browser_pool; such an instance may only be used on capture_pool()
+    threads, and close() leaves the pool's browsers running.
+
     Requires:
     - pip install playwright
     - playwright install chromium
     """
 
-    def __init__(self):
+    def __init__(self, use_shared_browser: bool = False):
+        self._use_shared_browser = use_shared_browser
         self._browser = None
         self._playwright = None
 
+    def _ensure_browser(self):
+        """Launch Chromium once and return the running browser."""
+        if self._use_shared_browser:
+            return get_browser()
+        if self._browser is None or not self._browser.is_connected():
+            if not PLAYWRIGHT_AVAILABLE:
+                raise ImportError(
+                    "Playwright is not installed. Run: pip install playwright && playwright install chromium"
+                )
+            if self._playwright is None:
+                self._playwright = sync_playwright().start()
+            logger.info("Launching headless Chromium browser...")
+            self._browser = self._playwright.chromium.launch(
+                headless=True,
+                args=BROWSER_LAUNCH_ARGS
+            )
+        return self._browser
+
+    def close(self):
+        """Shut down the browser and the Playwright driver."""
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception as e:
+                logger.debug(f"Error closing browser: {e}")
+            self._browser = None
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+    def _wait_until_ready(self, page, wait_for_selector: Optional[str], wait_time: int):
+        """
+        Wait for the page to be ready for capture.
+
+        When a selector is given, waits for it, then for the DOM to stop
+        changing (bounded by wait_time), then for two paint frames. The
+        selector alone can fire before components have rendered. The fixed
+        wait_time sleep is only used without a selector or when the selector
+        does not appear in time.
+        """
+        if wait_for_selector:
+            try:
+                page.wait_for_selector(wait_for_selector, timeout=15000)
+                if not page.evaluate(DOM_IDLE_JS, [DOM_IDLE_MS, max(wait_time, DOM_IDLE_MS)]):
+                    logger.debug(f"  DOM still changing after {wait_time}ms; capturing anyway")
+                page.wait_for_function(RENDER_SETTLED_JS, timeout=5000)
+                return
+            except Exception as e:
+                logger.warning(f"  Ready selector {wait_for_selector!r} not found, falling back to fixed wait: {e}")
+
+        if wait_time > 0:
+            time.sleep(wait_time / 1000)
+
+    def _take_screenshot(self, page, full_page: bool, image_format: str, quality: int) -> bytes:
+        """Capture the page in the requested image format."""
+        if image_format == 'jpeg':
+            return page.screenshot(type='jpeg', quality=quality, full_page=full_page)
+        return page.screenshot(type='png', full_page=full_page)
+
     def capture_html(
         self,
         html_content: str,
         viewport_width: int = 1920,
         viewport_height: int = 1080,
         full_page: bool = True,
-        wait_time: int = 2000
+        wait_time: int = 2000,
+        wait_for_selector: Optional[str] = None,
+        image_format: str = SCREENSHOT_FORMAT,
+        quality: int = SCREENSHOT_QUALITY
     ) -> bytes:
         """
         Capture screenshot from HTML content.
@@ -42,34 +188,49 @@ class PlaywrightScreenshotService:
             viewport_width: Browser viewport width
             viewport_height: Browser viewport height
             full_page: Whether to capture full scrollable page
-            wait_time: Time to wait for page to render (ms)
+            wait_time: Fallback wait (ms), used when no selector is given or it never appears
+            wait_for_selector: CSS selector that marks the page as ready to capture
+            image_format: 'jpeg' or 'png'
+            quality: JPEG quality (ignored for PNG)
 
         Returns:
-            PNG image bytes
+            Image bytes in the requested format
         """
-        from playwright.sync_api import sync_playwright
-        import time
-
         logger.info(f"Capturing HTML screenshot ({len(html_content):,} chars)")
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page(viewport={'width': viewport_width, 'height': viewport_height})
-
-            # Load HTML content
-            page.set_content(html_content)
+        browser = self._ensure_browser()
+        context = browser.new_context(viewport={'width': viewport_width, 'height': viewport_height})
+        try:
+            page = context.new_page()
+
+            # Load HTML content. Large documents go through a temp file so
+            # Chromium streams them from disk rather than receiving one huge
+            # CDP message.
+            if len(html_content) > HTML_FILE_THRESHOLD:
+                html_path = None
+                try:
+                    with tempfile.NamedTemporaryFile(
+                        'w', suffix='.html', encoding='utf-8', delete=False
+                    ) as f:
+                        f.write(html_content)
+                        html_path = f.name
+                    page.goto(f'file://{html_path}', wait_until='networkidle', timeout=30000)
+                finally:
+                    if html_path:
+                        os.unlink(html_path)
+            else:
+                page.set_content(html_content, wait_until='networkidle', timeout=30000)
 
             # Wait for rendering
-            if wait_time > 0:
-                time.sleep(wait_time / 1000)
+            self._wait_until_ready(page, wait_for_selector, wait_time)
 
             # Capture screenshot
-            screenshot_bytes = page.screenshot(type='png', full_page=full_page)
-
-            browser.close()
-            logger.info(f"  ✓ Screenshot captured ({len(screenshot_bytes):,} bytes)")
+            screenshot_bytes = self._take_screenshot(page, full_page, image_format, quality)
+        finally:
+            context.close()
 
-            return screenshot_bytes
+        logger.info(f"  ✓ Screenshot captured ({len(screenshot_bytes):,} bytes)")
+        return screenshot_bytes
 
     def capture_url(
         self,
@@ -78,7 +239,9 @@ class PlaywrightScreenshotService:
         viewport_height: int = 1080,
         full_page: bool = True,
         wait_for_selector: Optional[str] = None,
-        wait_time: int = 3000
+        wait_time: int = 3000,
+        image_format: str = SCREENSHOT_FORMAT,
+        quality: int = SCREENSHOT_QUALITY
     ) -> bytes:
         """
         Capture screenshot from a URL.
@@ -89,38 +252,33 @@ class PlaywrightScreenshotService:
             viewport_height: Browser viewport height
             full_page: Whether to capture full scrollable page
             wait_for_selector: CSS selector to wait for before capture
-            wait_time: Time to wait for page to render (ms)
+            wait_time: Fallback wait (ms), used when no selector is given or it never appears
+            image_format: 'jpeg' or 'png'
+            quality: JPEG quality (ignored for PNG)
 
         Returns:
-            PNG image bytes
+            Image bytes in the requested format
         """
-        from playwright.sync_api import sync_playwright
-        import time
-
         logger.info(f"Capturing URL screenshot: {url}")
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page(viewport={'width': viewport_width, 'height': viewport_height})
+        browser = self._ensure_browser()
+        context = browser.new_context(viewport={'width': viewport_width, 'height': viewport_height})
+        try:
+            page = context.new_page()
 
             # Navigate to URL
             page.goto(url, wait_until='networkidle', timeout=60000)
 
-            # Wait for selector if specified
-            if wait_for_selector:
-                page.wait_for_selector(wait_for_selector, timeout=15000)
-
-            # Additional wait time
-            if wait_time > 0:
-                time.sleep(wait_time / 1000)
+            # Wait for rendering
+            self._wait_until_ready(page, wait_for_selector, wait_time)
 
             # Capture screenshot
-            screenshot_bytes = page.screenshot(type='png', full_page=full_page)
-
-            browser.close()
-            logger.info(f"  ✓ Screenshot captured ({len(screenshot_bytes):,} bytes)")
+            screenshot_bytes = self._take_screenshot(page, full_page, image_format, quality)
+        finally:
+            context.close()
 
-            return screenshot_bytes
+        logger.info(f"  ✓ Screenshot captured ({len(screenshot_bytes):,} bytes)")
+        return screenshot_bytes
 
 
 def create_screenshot_service() -> PlaywrightScreenshotService:
@@ -133,14 +291,102 @@ def create_screenshot_service() -> PlaywrightScreenshotService:
     Raises:
         ImportError if Playwright is not installed
     """
-    try:
-        from playwright.sync_api import sync_playwright
-        logger.info("Playwright screenshot service initialized")
-        return PlaywrightScreenshotService()
-    except ImportError:
+    if not PLAYWRIGHT_AVAILABLE:
         raise ImportError(
             "Playwright is not installed. Run: pip install playwright && playwright install chromium"
         )
+    logger.info("Playwright screenshot service initialized")
+    return PlaywrightScreenshotService()
+
+
+# Stateless front end to the shared pool browsers; use only on capture_pool() threads
+_shared_service = PlaywrightScreenshotService(use_shared_browser=True)
+
+
+def shutdown_screenshot_service():
+    """Close every shared browser that has been launched."""
+    global _warmup_done
+    reset_browser_pool()
+    with _warmup_lock:
+        _warmup_done = False
+
+
+@lru_cache(maxsize=8)
+def _parse_template(html_content: str) -> Tuple[str, ...]:
+    """Split a template into alternating literal text and placeholder names."""
+    return tuple(_PLACEHOLDER_RE.split(html_content))
+
+
+def _json_dumps(value: Any) -> str:
+    """Serialize a template value to JSON, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode('utf-8')
+        except TypeError:
+            # orjson rejects non-str dict keys; the stdlib encoder coerces them
+            pass
+    return json.dumps(value)
+
+
+def _prepare_component_html(html_content: str, data_replacements: Dict[str, Any]) -> str:
+    """Fill template variables and add the export mode indicator."""
+    # Replace template variables in a single pass over the parsed template
+    parts = list(_parse_template(html_content))
+    for i in range(1, len(parts), 2):
+        key = parts[i]
+        if key in data_replacements:
+            value = data_replacements[key]
+            parts[i] = _json_dumps(value) if isinstance(value, (dict, list)) else str(value)
+        else:
+            parts[i] = '{{' + key + '}}'
+    processed_html = ''.join(parts)
+
+    # Add export mode indicator to the HTML
+    return processed_html.replace('</head>', EXPORT_MODE_SCRIPT + '</head>')
+
+
+def capture_react_components(
+    components: List[Tuple[str, str, Dict[str, Any]]],
+    viewport_width: int = 1920,
+    viewport_height: int = 1080,
+    wait_time: int = 4000,
+    image_format: str = SCREENSHOT_FORMAT
+) -> Dict[str, bytes]:
+    """
+    Capture several React components in parallel.
+
+    Components are spread across the shared capture pool (core.browser_pool),
+    each rendering into its own BrowserContext on a persistent browser.
+
+    Args:
+        components: List of (component_name, html_content, data_replacements)
+        viewport_width: Viewport width
+        viewport_height: Viewport height
+        wait_time: Fallback wait (ms) if the export-ready marker never appears
+        image_format: 'jpeg' or 'png'
+
+    Returns:
+        Dict mapping component name to image bytes
+    """
+    pool = capture_pool()
+
+    futures = {}
+    for component_name, html_content, data_replacements in components:
+        logger.info(f"Capturing React component: {component_name}")
+        processed_html = _prepare_component_html(html_content, data_replacements)
+        futures[component_name] = pool.submit(
+            lambda html: _shared_service.capture_html(
+                html,
+                viewport_width=viewport_width,
+                viewport_height=viewport_height,
+                wait_time=wait_time,
+                wait_for_selector=EXPORT_READY_SELECTOR,
+                image_format=image_format
+            ),
+            processed_html
+        )
+
+    return {name: future.result() for name, future in futures.items()}
 
 
 def capture_react_component(
@@ -149,7 +395,8 @@ def capture_react_component(
     data_replacements: Dict[str, Any],
     viewport_width: int = 1920,
     viewport_height: int = 1080,
-    wait_time: int = 4000
+    wait_time: int = 4000,
+    image_format: str = SCREENSHOT_FORMAT
 ) -> bytes:
     """
     Convenience function to capture a React component screenshot.
@@ -160,56 +407,93 @@ def capture_react_component(
         data_replacements: Dictionary of template variables to replace
         viewport_width: Viewport width
         viewport_height: Viewport height
-        wait_time: Time to wait for React to render
+        wait_time: Fallback wait (ms) if the export-ready marker never appears
+        image_format: 'jpeg' or 'png'
 
     Returns:
-        PNG image bytes
+        Image bytes in the requested format
     """
-    logger.info(f"Capturing React component: {component_name}")
-
-    # Replace template variables
-    processed_html = html_content
-    for key, value in data_replacements.items():
-        placeholder = '{{' + key + '}}'
-        if placeholder in processed_html:
-            if isinstance(value, (dict, list)):
-                processed_html = processed_html.replace(placeholder, json.dumps(value))
-            else:
-                processed_html = processed_html.replace(placeholder, str(value))
-
-    # Add export mode indicator to the HTML
-    export_script = """
-    <script>
-        window.EXPORT_MODE = true;
-        window.addEventListener('load', function() {
-            document.body.setAttribute('data-export-mode', 'true');
-        });
-    </script>
-    """
-    processed_html = processed_html.replace('</head>', f'{export_script}</head>')
-
-    # Capture screenshot using Playwright
-    service = create_screenshot_service()
-    return service.capture_html(
-        processed_html,
+    screenshots = capture_react_components(
+        [(component_name, html_content, data_replacements)],
         viewport_width=viewport_width,
         viewport_height=viewport_height,
-        wait_time=wait_time
+        wait_time=wait_time,
+        image_format=image_format
     )
+    return screenshots[component_name]
+
 
+_warmup_lock = threading.Lock()
+_warmup_done = False
 
-def test_screenshot_service() -> bool:
+
+def warmup_screenshot_service(warm_template_html: Optional[str] = None) -> bool:
+    """
+    Launch the shared capture browsers ahead of the first real capture.
+
+    Succeeds once per process; a failed warmup is retried on the next call.
+    Every core.browser_pool thread is warmed, so this covers the Streamlit
+    section captures too. Standalone services from create_screenshot_service()
+    are unaffected.
+
+    Args:
+        warm_template_html: Optional real component template to render once so
+                            Chromium has parsed and compiled its JS bundle
+
+    Returns:
+        True if every pool browser rendered successfully
+    """
+    global _warmup_done
+
+    if warm_template_html:
+        html_content = _prepare_component_html(warm_template_html, {})
+    else:
+        html_content = "<html><body><h1>Warmup</h1></body></html>"
+
+    # Held for the whole warmup so concurrent callers wait for its outcome
+    with _warmup_lock:
+        if _warmup_done:
+            return True
+        try:
+            results = run_on_every_worker(
+                capture_pool(),
+                lambda: _shared_service.capture_html(
+                    html_content, viewport_width=800, viewport_height=600, wait_time=0
+                )
+            )
+        except Exception as e:
+            logger.warning(f"Screenshot service warmup failed: {e}")
+            return False
+        _warmup_done = True
+
+    logger.info(f"Screenshot service warmed up ({len(results)} browser(s))")
+    return True
+
+
+def test_screenshot_service(warm_template_html: Optional[str] = None, persistent: bool = False) -> bool:
     """
     Test if screenshot service is working.
 
+    Args:
+        warm_template_html: Optional template to render instead of the test page
+        persistent: If True, test (and warm) the shared capture browser rather
+                    than launching and closing a throwaway one
+
     Returns:
         True if service is operational
     """
+    if persistent:
+        return warmup_screenshot_service(warm_template_html)
+
+    service = None
     try:
         service = create_screenshot_service()
-        test_html = "<html><body><h1>Test</h1></body></html>"
+        test_html = warm_template_html or "<html><body><h1>Test</h1></body></html>"
         result = service.capture_html(test_html, viewport_width=800, viewport_height=600)
         return len(result) > 0
     except Exception as e:
         logger.error(f"Screenshot service test failed: {e}")
         return False
+    finally:
+        if service is not None:
+            service.close()
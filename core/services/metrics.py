@@ -1,55 +1,232 @@
 # services/metrics_service.py
+import re
+import sys
+import builtins
+import heapq
+from functools import lru_cache
+from operator import itemgetter
+import numpy as np
+from types import MappingProxyType
 from core.models.metrics import MetricsData, RadarChartData
+from core.services import _metrics_kernels
 from core.utils import hash
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional, Tuple
+
+# Canonical metric names, interned so scores dicts built from these share the
+# key objects of the tables below and lookups hit the identity fast path
+METRIC_NAMES = tuple(sys.intern(name) for name in (
+    "Cultural Relevance",
+    "Representation",
+    "Cultural Vernacular",
+    "Cultural Authority",
+    "Buzz & Conversation",
+    "Commerce Bridge",
+    "Geo-Cultural Fit",
+    "Media Ownership Equity",
+    "Platform Relevance",
+))
+
+
+def _frozen_table(table: Dict[str, float]) -> Mapping[str, float]:
+    """Read-only copy of a metric table keyed by the interned metric names."""
+    return MappingProxyType({sys.intern(name): value for name, value in table.items()})
+
+
+# ROI potential weights (unlisted metrics weigh 0.8)
+_WEIGHTED_METRICS = _frozen_table({
+    "Cultural Authority": 1.5,
+    "Buzz & Conversation": 1.3,
+    "Cultural Vernacular": 1.2,
+    "Commerce Bridge": 1.2,
+    "Platform Relevance": 1.1
+})
+
+# RCC score weights (unlisted metrics weigh 1.0)
+_RCC_WEIGHTS = _frozen_table({
+    "Cultural Authority": 1.3,
+    "Cultural Vernacular": 1.2,
+    "Cultural Relevance": 1.2,
+    "Buzz & Conversation": 1.1,
+    "Platform Relevance": 1.0,
+    "Representation": 1.0,
+    "Geo-Cultural Fit": 0.9,
+    "Commerce Bridge": 0.9,
+    "Media Ownership Equity": 0.8
+})
+
+# Benchmark adjustments per brief keyword class. Read-only so cached lookups
+# can hand out the same object every time.
+_ADJ_NONE = _frozen_table({})
+_ADJ_GENZ = _frozen_table({
+    "Cultural Vernacular": 2.0,
+    "Platform Relevance": 2.2,
+    "Buzz & Conversation": 2.0
+})
+_ADJ_HISPANIC = _frozen_table({
+    "Cultural Relevance": 2.1,
+    "Representation": 2.0,
+    "Geo-Cultural Fit": 1.8
+})
+_ADJ_LUXURY = _frozen_table({
+    "Cultural Authority": 2.2,
+    "Media Ownership Equity": 1.8,
+    "Commerce Bridge": 1.7
+})
+_ADJ_RETAIL = _frozen_table({
+    "Commerce Bridge": 2.3,
+    "Platform Relevance": 1.9,
+    "Buzz & Conversation": 1.7
+})
+_ADJ_DEFAULT = _frozen_table({
+    "Cultural Relevance": 1.7,
+    "Platform Relevance": 1.8,
+    "Cultural Vernacular": 1.7,
+    "Cultural Authority": 1.7,
+    "Buzz & Conversation": 1.8,
+    "Commerce Bridge": 1.7,
+    "Geo-Cultural Fit": 1.6,
+    "Media Ownership Equity": 1.6,
+    "Representation": 1.7
+})
+
+
+# One scan for every brief keyword class. Group numbers give the class
+# priority; audience keywords are case-sensitive, category keywords are not.
+_BRIEF_KEYWORD_RE = re.compile(
+    r'(Gen Z|GenZ|Generation Z)'
+    r'|(Hispanic|Latino)'
+    r'|(?i:(luxury|premium)|(retail|shopping))'
+)
+_ADJ_BY_GROUP = (None, _ADJ_GENZ, _ADJ_HISPANIC, _ADJ_LUXURY, _ADJ_RETAIL)
+
+# First percentage in an AI performance prediction, e.g. "+25%" or "25%"
+_ROI_RE = re.compile(r'\+?(\d+)%')
+
+
+@lru_cache(maxsize=256)
+def _adjustments_for(brief_text: str) -> Mapping[str, float]:
+    """Pick the benchmark adjustments for a brief; memoized per brief text."""
+    best = len(_ADJ_BY_GROUP)
+    for match in _BRIEF_KEYWORD_RE.finditer(brief_text):
+        best = min(best, match.lastindex)
+        if best == 1:
+            break
+    if best < len(_ADJ_BY_GROUP):
+        return _ADJ_BY_GROUP[best]
+    return _ADJ_DEFAULT
+
+
+def _as_arrays(scores: Dict[str, float]) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """Split a scores dict into parallel (metric names, float64 values) views."""
+    keys = tuple(scores)
+    vals = np.fromiter(scores.values(), dtype=np.float64, count=len(keys))
+    return keys, vals
+
+
+def _closed_ring(vals: np.ndarray) -> np.ndarray:
+    """Copy vals into a length n+1 array whose last entry repeats the first."""
+    n = vals.shape[0]
+    ring = np.empty(n + 1, dtype=np.float64)
+    ring[:n] = vals
+    ring[n] = vals[0]
+    return ring
+
+
+def _weighted_average(keys: Tuple[str, ...], vals: np.ndarray, weights: Mapping[str, float],
+                      default_weight: float, fallback: Optional[float]) -> Optional[float]:
+    """Weighted mean of vals; fallback if weights sum to 0."""
+    w = np.fromiter((weights.get(m, default_weight) for m in keys), dtype=np.float64, count=len(keys))
+    avg = _metrics_kernels.weighted_avg(vals, w)
+    if np.isnan(avg):
+        return fallback
+    return float(avg)
+
+
+@lru_cache(maxsize=256)
+def _adjustment_vector(brief_text: str, keys: Tuple[str, ...]) -> np.ndarray:
+    """Benchmark adjustments for a brief, aligned to keys (1.5 where unlisted)."""
+    adjustments = _adjustments_for(brief_text) if brief_text else _ADJ_NONE
+    vec = np.fromiter((adjustments.get(m, 1.5) for m in keys), dtype=np.float64, count=len(keys))
+    vec.flags.writeable = False
+    return vec
+
+
+@lru_cache(maxsize=256)
+def hash_brief(brief_text: str) -> Optional[int]:
+    """Deterministic 0-99 brief hash used to nudge the RCC score; None for no brief."""
+    if not brief_text:
+        return None
+    return hash(brief_text)
+
 
 class MetricsService:
+    __slots__ = ("weighted_metrics",)
+
     def __init__(self):
-        self.weighted_metrics = {
-            "Cultural Authority": 1.5,
-            "Buzz & Conversation": 1.3,
-            "Cultural Vernacular": 1.2,
-            "Commerce Bridge": 1.2,
-            "Platform Relevance": 1.1
-        }
+        self.weighted_metrics = _WEIGHTED_METRICS
     
     def process_metrics(self, metrics_data: MetricsData) -> RadarChartData:
-        """Process raw metrics data into structured format for visualization."""
-        # Calculate average score
-        avg_score = sum(metrics_data.scores.values()) / len(metrics_data.scores)
-        
-        # Process scores for radar chart
-        categories = list(metrics_data.scores.keys())
-        values = list(metrics_data.scores.values())
+        """
+        Process raw metrics data into structured format for visualization.
+
+        Results are memoized on the inputs that affect them (scores in order,
+        brief text, and the AI performance prediction), so rerenders of the
+        same report skip the computation. Each call gets its own copy of the
+        list fields, so callers may mutate the result.
+        """
+        ai_insights = metrics_data.ai_insights
+        if ai_insights and 'performance_prediction' in ai_insights:
+            prediction_key = (True, ai_insights['performance_prediction'])
+        else:
+            prediction_key = (False, None)
+
+        cache_key = (tuple(metrics_data.scores.items()), metrics_data.brief_text, prediction_key)
+        try:
+            # core.utils.hash is the brief string hash; probe with the builtin
+            builtins.hash(cache_key)
+        except TypeError:
+            # Unhashable input (e.g. a non-string prediction); compute directly
+            return self._process_metrics(metrics_data)
+
+        return _copy_chart_data(_process_metrics_cached(*cache_key))
+
+    def _process_metrics(self, metrics_data: MetricsData) -> RadarChartData:
+        """Uncached implementation of process_metrics."""
+        # One pass over the scores dict; everything below works on these views
+        keys, vals = _as_arrays(metrics_data.scores)
+
+        # Calculate average score. Python's left-to-right sum, not
+        # vals.mean(), whose pairwise summation can round differently
+        scores = metrics_data.scores
+        avg_score = sum(scores.values()) / len(scores)
         
-        # Add first value at end to close the loop
-        categories.append(categories[0])
-        values.append(values[0])
+        # Process scores for radar chart, adding the first value at the end
+        # to close the loop
+        categories = [*keys, keys[0]]
+        values = _closed_ring(vals).tolist()
         
         # Generate benchmark values
         benchmark_values = self._generate_benchmark_values(
-            metrics_data.scores, 
+            keys, vals,
             metrics_data.brief_text
         )
         
         # Calculate RCC score
-        rcc_score = self._calculate_rcc_score(
-            metrics_data.scores, 
-            metrics_data.brief_text, 
+        rcc_score = self._rcc_score(
+            keys, vals,
+            hash_brief(metrics_data.brief_text), 
             avg_score
         )
         
         # Calculate ROI potential
         roi_potential = self._calculate_roi_potential(
-            metrics_data.scores, 
-            metrics_data.ai_insights
+            keys, vals,
+            metrics_data.ai_insights,
+            avg_score
         )
         
         # Get top strengths
-        top_strengths = self._get_top_strengths(
-            metrics_data.scores, 
-            metrics_data.ai_insights
-        )
+        top_strengths = self._get_top_strengths(metrics_data.scores)
         
         return RadarChartData(
             categories=categories,
@@ -60,134 +237,86 @@ class MetricsService:
             top_strengths=top_strengths
         )
     
-    def _generate_benchmark_values(self, scores: Dict[str, float], brief_text: str) -> List[float]:
+    def _generate_benchmark_values(self, keys: Tuple[str, ...], vals: np.ndarray, brief_text: str) -> List[float]:
         """Generate benchmark values based on brief content."""
-        benchmark_adjustments = self._get_benchmark_adjustments(brief_text)
-        
-        benchmark_values = []
-        for metric in scores.keys():
-            current_score = scores[metric]
-            adjustment = benchmark_adjustments.get(metric, 1.5)
-            benchmark = min(10.0, current_score + adjustment)
-            benchmark_values.append(benchmark)
-        
-        # Add first value at end to close the loop
-        benchmark_values.append(benchmark_values[0])
-        return benchmark_values
+        # Includes the first value again at the end to close the loop
+        return _metrics_kernels.benchmark_values(vals, _adjustment_vector(brief_text, keys)).tolist()
     
-    def _get_benchmark_adjustments(self, brief_text: str) -> Dict[str, float]:
+    def _get_benchmark_adjustments(self, brief_text: str) -> Mapping[str, float]:
         """Get benchmark adjustments based on brief content."""
         if not brief_text:
-            return {}
-            
-        if "Gen Z" in brief_text or "GenZ" in brief_text or "Generation Z" in brief_text:
-            return {
-                "Cultural Vernacular": 2.0,
-                "Platform Relevance": 2.2,
-                "Buzz & Conversation": 2.0
-            }
-        elif "Hispanic" in brief_text or "Latino" in brief_text:
-            return {
-                "Cultural Relevance": 2.1,
-                "Representation": 2.0,
-                "Geo-Cultural Fit": 1.8
-            }
-        elif "luxury" in brief_text.lower() or "premium" in brief_text.lower():
-            return {
-                "Cultural Authority": 2.2,
-                "Media Ownership Equity": 1.8,
-                "Commerce Bridge": 1.7
-            }
-        elif "retail" in brief_text.lower() or "shopping" in brief_text.lower():
-            return {
-                "Commerce Bridge": 2.3,
-                "Platform Relevance": 1.9,
-                "Buzz & Conversation": 1.7
-            }
-        else:
-            return {
-                "Cultural Relevance": 1.7,
-                "Platform Relevance": 1.8,
-                "Cultural Vernacular": 1.7,
-                "Cultural Authority": 1.7,
-                "Buzz & Conversation": 1.8,
-                "Commerce Bridge": 1.7,
-                "Geo-Cultural Fit": 1.6,
-                "Media Ownership Equity": 1.6,
-                "Representation": 1.7
-            }
+            return _ADJ_NONE
+        return _adjustments_for(brief_text)
     
-    def _calculate_rcc_score(self, scores: Dict[str, float], brief_text: str, avg_score: float) -> float:
-        """Calculate Resonance Convergence Coefficient score."""
-        if not brief_text or not scores:
+    def _calculate_rcc_score(self, scores: Dict[str, float], brief_hash: Optional[int], avg_score: float) -> float:
+        """Calculate Resonance Convergence Coefficient score.
+
+        brief_hash comes from hash_brief(); None means there is no brief.
+        """
+        if brief_hash is None or not scores:
             return avg_score
-            
-        weights = {
-            "Cultural Authority": 1.3,
-            "Cultural Vernacular": 1.2,
-            "Cultural Relevance": 1.2,
-            "Buzz & Conversation": 1.1,
-            "Platform Relevance": 1.0,
-            "Representation": 1.0,
-            "Geo-Cultural Fit": 0.9,
-            "Commerce Bridge": 0.9,
-            "Media Ownership Equity": 0.8
-        }
-        
-        weighted_sum = 0
-        total_weight = 0
-        
-        for metric, score in scores.items():
-            weight = weights.get(metric, 1.0)
-            weighted_sum += score * weight
-            total_weight += weight
-        
-        weighted_avg = weighted_sum / total_weight if total_weight > 0 else avg_score
+        return self._rcc_score(*_as_arrays(scores), brief_hash, avg_score)
+
+    def _rcc_score(self, keys: Tuple[str, ...], vals: np.ndarray,
+                   brief_hash: Optional[int], avg_score: float) -> float:
+        """RCC score over the (keys, vals) view of the scores."""
+        if brief_hash is None or not keys:
+            return avg_score
+
+        weighted_avg = _weighted_average(keys, vals, _RCC_WEIGHTS, 1.0, avg_score)
         
-        brief_hash = hash(brief_text)
         score_adjustment = ((brief_hash % 100) / 100) * 0.4 - 0.2
         
         adjusted_score = min(10, max(1, weighted_avg + score_adjustment))
         return round(adjusted_score * 10) / 10
     
-    def _calculate_roi_potential(self, scores: Dict[str, float], ai_insights: Optional[Dict]) -> str:
+    def _calculate_roi_potential(self, keys: Tuple[str, ...], vals: np.ndarray,
+                                 ai_insights: Optional[Dict], avg_score: float) -> str:
         """Calculate ROI potential."""
         if ai_insights and 'performance_prediction' in ai_insights:
             prediction = ai_insights['performance_prediction']
-            if '%' in prediction:
-                import re
-                roi_match = re.search(r'(\+\d+%|\d+%)', prediction)
+            # Non-string predictions (None, numbers) fall through to the estimate
+            if isinstance(prediction, str):
+                roi_match = _ROI_RE.search(prediction)
                 if roi_match:
-                    roi_potential = roi_match.group(0)
-                    if not roi_potential.startswith('+'):
-                        roi_potential = f"+{roi_potential}"
-                    return roi_potential
-        
-        roi_sum = 0
-        roi_weight_total = 0
-        
-        for metric, score in scores.items():
-            weight = self.weighted_metrics.get(metric, 0.8)
-            roi_sum += score * weight
-            roi_weight_total += weight
+                    return f"+{roi_match.group(1)}%"
         
-        if roi_weight_total > 0:
-            roi_score = roi_sum / roi_weight_total
-            roi_percent = int(5 + (roi_score / 10) * 20)
-            return f"+{roi_percent}%"
-        else:
-            avg_score = sum(scores.values()) / len(scores)
-            roi_percent = int(5 + (avg_score / 10) * 20)
-            return f"+{roi_percent}%"
+        roi_score = _weighted_average(keys, vals, self.weighted_metrics, 0.8, avg_score)
+        roi_percent = int(5 + (roi_score / 10) * 20)
+        return f"+{roi_percent}%"
     
-    def _get_top_strengths(self, scores: Dict[str, float], ai_insights: Optional[Dict]) -> List[str]:
+    def _get_top_strengths(self, scores: Dict[str, float], ai_insights: Optional[Dict] = None) -> List[str]:
         """Get top campaign strengths: the two highest-scoring metrics.
 
         Score-driven to match the dashboard's Campaign Strengths panel; the LLM's
         narrative strengths[0:2] are no longer used. ai_insights is accepted for
         signature compatibility but unused.
         """
-        
-        metric_scores = list(scores.items())
-        metric_scores.sort(key=lambda x: x[1], reverse=True)
-        return [m[0] for m in metric_scores[:2]]
+        top = heapq.nlargest(2, scores.items(), key=itemgetter(1))
+        return [m[0] for m in top]
+
+
+def _copy_chart_data(data: RadarChartData) -> RadarChartData:
+    """Copy of a cached RadarChartData with fresh lists, so callers can't alter the cache."""
+    return RadarChartData(
+        categories=list(data.categories),
+        values=list(data.values),
+        benchmark_values=list(data.benchmark_values),
+        rcc_score=data.rcc_score,
+        roi_potential=data.roi_potential,
+        top_strengths=list(data.top_strengths)
+    )
+
+
+@lru_cache(maxsize=64)
+def _process_metrics_cached(score_items: Tuple[Tuple[str, float], ...], brief_text: str,
+                            prediction_key: Tuple[bool, Optional[str]]) -> RadarChartData:
+    """Memoized process_metrics, keyed only on the inputs it reads."""
+    has_prediction, prediction = prediction_key
+    metrics_data = MetricsData(
+        scores=dict(score_items),
+        brief_text=brief_text,
+        improvement_areas=[],
+        ai_insights={'performance_prediction': prediction} if has_prediction else None
+    )
+    return MetricsService()._process_metrics(metrics_data)
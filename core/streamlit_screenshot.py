@@ -2,18 +2,29 @@
 Streamlit Screenshot Service - Captures screenshots of Streamlit tabs using Playwright.
 """
 
+import io
 import os
 import json
+import hashlib
+import struct
 import tempfile
+import threading
 import time
 import logging
-from io import BytesIO
-from typing import Dict, Any, List, Optional, Tuple
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from html import escape
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 from pathlib import Path
 
+# reset_browser_pool is re-exported: callers close capture browsers through here
+from core.browser_pool import CAPTURE_WORKERS, browser_context, capture_pool, reset_browser_pool
+
 # Configure logging
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(name)s: %(message)s')
 
 
 # =============================================================================
@@ -53,6 +64,8 @@ logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(name)s: %(mess
 #   - extra_padding: Extra viewport padding
 #   - min_height: Minimum viewport height (optional)
 #   - capture_mode: "panel" (default) or "full_page"
+#   - lossy_ok: Chart/image-heavy sections that may be captured as JPEG when
+#     SCREENSHOT_FORMAT is "jpeg" (text-heavy sections always stay PNG)
 #
 # =============================================================================
 
@@ -115,6 +128,7 @@ SECTION_SCREENSHOT_CONFIG = {
         "crop_top": 0,  # Reduced from 80 - was clipping top
         "crop_bottom": 0,  # Reduced from 150 - was clipping bottom
         "extra_padding": 200,
+        "lossy_ok": True,  # Platform/brand cards and logos
     },
     "Trend Analysis": {
         "source_tab": "Trend Analysis",
@@ -122,16 +136,29 @@ SECTION_SCREENSHOT_CONFIG = {
         "crop_top": 0,  # Reduced from 130
         "crop_bottom": 0,  # Reduced from 380 - was clipping bottom
         "extra_padding": 200,  # Increased from 0
+        "lossy_ok": True,  # Heatmap
     },
 }
 
+# Read-only at runtime: the tab config below shares these section entries, so
+# a mutation through either name would silently change the other
+SECTION_SCREENSHOT_CONFIG = MappingProxyType({
+    name: MappingProxyType(config) for name, config in SECTION_SCREENSHOT_CONFIG.items()
+})
+
 # Legacy config for backward compatibility (maps tab names to first section)
-TAB_SCREENSHOT_CONFIG = {
+TAB_SCREENSHOT_CONFIG = MappingProxyType({
     "Detailed Metrics": SECTION_SCREENSHOT_CONFIG["Score Card"],
     "Audience Insights": SECTION_SCREENSHOT_CONFIG["Psychographic Highlights & Audience Summary"],
     "Media Affinities": SECTION_SCREENSHOT_CONFIG["Media Affinities"],
     "Trend Analysis": SECTION_SCREENSHOT_CONFIG["Trend Analysis"],
-}
+})
+
+# Audience Insights lays its content out inside stMain's inner scroller, so
+# the panel never reports scrollHeight > clientHeight and the fit-to-content
+# resize can't grow the viewport for it. Both capture paths start this tab at
+# a viewport tall enough for the whole tab instead.
+AUDIENCE_INSIGHTS_VIEWPORT_HEIGHT = 3450
 
 # =============================================================================
 # SECTION MAPPING - Maps UI checkbox keys to screenshot section names
@@ -148,10 +175,30 @@ SECTION_MAPPING = {
     'trends': ['Trend Analysis'],
 }
 
+# Number of browsers capture_streamlit_sections runs in parallel: the size of
+# the shared capture pool (core.browser_pool, SECTION_CAPTURE_WORKERS env var).
+# Each one is a separate Chromium process and Streamlit session.
+SECTION_CAPTURE_WORKERS = CAPTURE_WORKERS
+
+# Screenshot encoding for lossy_ok sections: "png" (default) or "jpeg".
+# Chromium encodes JPEG several times faster than PNG, and the slides accept
+# either format.
+SCREENSHOT_FORMAT = os.environ.get("SCREENSHOT_FORMAT", "png").lower()
+JPEG_QUALITY = 92
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
 # Debug mode - set to True to save original + cropped images for comparison
 DEBUG_SCREENSHOTS = False
 DEBUG_OUTPUT_DIR = "/tmp/ari_screenshot_debug"
 
+
+def _debug_output_dir() -> str:
+    """Create (if needed) and return the debug screenshot directory."""
+    os.makedirs(DEBUG_OUTPUT_DIR, exist_ok=True)
+    return DEBUG_OUTPUT_DIR
+
+
 # =============================================================================
 # JAVASCRIPT FUNCTIONS FOR SECTION HIDING/SHOWING
 # =============================================================================
@@ -190,72 +237,145 @@ SECTION_JS_FUNCTIONS = '''
 //
 // =============================================================================
 
+// Last panel returned by getResultsPanel(). Reused while it is still in the
+// document and still the visible panel; switching tabs hides it, and a
+// Streamlit rerender detaches it, so either forces a fresh lookup.
+let _cachedResultsPanel = null;
+
 function getResultsPanel() {
-    // Get the active panel from the results tabs
+    if (_cachedResultsPanel && _cachedResultsPanel.isConnected &&
+            !_cachedResultsPanel.hasAttribute('hidden')) {
+        return _cachedResultsPanel;
+    }
+    _cachedResultsPanel = findResultsPanel();
+    return _cachedResultsPanel;
+}
+
+// Tab buttons by label (first match wins), built by listTabs(). A Streamlit
+// rerender detaches the buttons, which makes clickTab() rebuild the map.
+let _tabsByName = null;
+
+function listTabs() {
+    const tabs = document.querySelectorAll('[data-baseweb="tab"]');
+    const names = [];
+    _tabsByName = new Map();
+    for (const tab of tabs) {
+        const name = tab.textContent.trim();
+        names.push(name);
+        if (!_tabsByName.has(name)) _tabsByName.set(name, tab);
+    }
+    return names;
+}
+
+function clickTab(name) {
+    let tab = _tabsByName && _tabsByName.get(name);
+    if (!tab || !tab.isConnected) {
+        listTabs();
+        tab = _tabsByName.get(name);
+    }
+    if (!tab) return false;
+    tab.click();
+    return true;
+}
+
+function hasDetailedMetricsTab(tabsContainer) {
+    for (const btn of tabsContainer.querySelectorAll('[data-baseweb="tab"]')) {
+        if (btn.textContent.includes('Detailed Metrics')) return true;
+    }
+    return false;
+}
+
+function tagResultsTabs() {
+    // Mark the results stTabs container (the one holding the "Detailed Metrics"
+    // tab) with data-ari-results so later lookups are a single selector match.
     // In export mode, allTabs[0] is results; in normal mode, allTabs[1] is results
-    // We identify results tabs by looking for "Detailed Metrics" tab button
     const allTabs = document.querySelectorAll('[data-testid="stTabs"]');
     if (allTabs.length === 0) {
-        console.log('[SECTION] getResultsPanel: No stTabs found');
-        return null;
+        console.log('[SECTION] tagResultsTabs: No stTabs found');
+        return false;
     }
 
-    // Find which stTabs contains the "Detailed Metrics" tab
+    // Drop any earlier tag so only one container is ever marked
+    document.querySelectorAll('[data-ari-results]').forEach(el => {
+        delete el.dataset.ariResults;
+    });
+
     let resultsTabs = null;
-    for (const tabsContainer of allTabs) {
-        const tabButtons = tabsContainer.querySelectorAll('[data-baseweb="tab"]');
-        for (const btn of tabButtons) {
-            if (btn.innerText.includes('Detailed Metrics')) {
-                resultsTabs = tabsContainer;
-                console.log('[SECTION] getResultsPanel: Found results tabs with Detailed Metrics');
-                break;
-            }
+    for (const btn of document.querySelectorAll('[data-testid="stTabs"] [data-baseweb="tab"]')) {
+        if (btn.textContent.includes('Detailed Metrics')) {
+            resultsTabs = btn.closest('[data-testid="stTabs"]');
+            break;
         }
-        if (resultsTabs) break;
     }
 
     if (!resultsTabs) {
-        console.log('[SECTION] getResultsPanel: Could not find results tabs by content');
+        console.log('[SECTION] tagResultsTabs: Could not find results tabs by content');
         // Fallback to first stTabs
         resultsTabs = allTabs[0];
     }
 
-    const panels = resultsTabs.querySelectorAll(':scope > div > [role="tabpanel"]');
-    for (const panel of panels) {
-        if (!panel.hasAttribute('hidden')) {
-            return panel;
-        }
+    resultsTabs.dataset.ariResults = '1';
+    return true;
+}
+
+function findResultsPanel() {
+    // Re-tag when Streamlit replaced the container on rerender (dropping the
+    // tag), or when the tag is the allTabs[0] fallback set before "Detailed
+    // Metrics" rendered
+    const tagged = document.querySelector('[data-ari-results]');
+    if ((!tagged || !hasDetailedMetricsTab(tagged)) && !tagResultsTabs()) {
+        return null;
+    }
+    const panel = document.querySelector('[data-ari-results] > div > [role="tabpanel"]:not([hidden])');
+    if (!panel) {
+        console.log('[SECTION] getResultsPanel: No active panel found');
     }
-    console.log('[SECTION] getResultsPanel: No active panel found');
-    return null;
+    return panel;
 }
 
+const _vBlockCache = new WeakMap();
+
 function getVerticalBlockChildren(panel) {
-    // Get direct children of stVerticalBlock inside panel
+    // Get direct children of stVerticalBlock inside panel. Cached per panel
+    // until Streamlit replaces the block or changes its child count.
+    const cached = _vBlockCache.get(panel);
+    if (cached && cached.vBlock.isConnected &&
+        cached.vBlock.childElementCount === cached.children.length) {
+        return cached.children;
+    }
     const vBlock = panel.querySelector('[data-testid="stVerticalBlock"]');
     if (!vBlock) {
         console.log('[SECTION] getVerticalBlockChildren: stVerticalBlock not found');
         return [];
     }
-    return Array.from(vBlock.children);
+    const children = Array.from(vBlock.children);
+    _vBlockCache.set(panel, {vBlock, children});
+    return children;
+}
+
+function hideSectionChild(child) {
+    // The .ari-hidden rule (SECTION_HIDE_CSS) does the hiding, so a toggle is
+    // one class change instead of several inline style writes
+    child.classList.add('ari-hidden');
 }
 
 function hideChildrenByIndices(children, indicesToHide) {
     // Hide children at specific indices
     indicesToHide.forEach(i => {
         if (children[i]) {
-            children[i].style.display = 'none';
+            hideSectionChild(children[i]);
         }
     });
 }
 
 function showChildrenByIndices(children, indicesToShow) {
     // Hide ALL children except those at specific indices
-    children.forEach((child, i) => {
-        if (!indicesToShow.includes(i)) {
-            child.style.display = 'none';
+    const keep = new Set(indicesToShow);
+    for (let i = 0, n = children.length; i < n; i++) {
+        if (!keep.has(i)) {
+            hideSectionChild(children[i]);
         }
-    });
+    }
 }
 
 // =============================================================================
@@ -403,34 +523,416 @@ function showEmergingOpportunity() {
     return true;
 }
 
+// Prepare a section for capture in a single page round-trip
+function prepareSection(jsSetupName) {
+    // Everything a section needs before capture, in one call: restore the
+    // panel, apply the section's visibility function, hide the tab bar and
+    // mark the results panel for selection
+    restoreAllSections();
+    const setupResult = jsSetupName ? window[jsSetupName]() : null;
+
+    const tabList = document.querySelector('[data-baseweb="tab-list"]');
+    if (tabList && tabList.style.display !== 'none') tabList.style.display = 'none';
+
+    const panel = getResultsPanel();
+    if (!panel) {
+        return {
+            setupResult,
+            selector: '[data-baseweb="tab-panel"]',
+            message: 'No active results panel, using first tab-panel'
+        };
+    }
+    // Sections from the same tab share the panel: it is already marked, so
+    // only a tab switch needs the old marker cleared and a new one set
+    if (!panel.hasAttribute('data-capture-target')) {
+        document.querySelectorAll('[data-capture-target]').forEach(el => {
+            el.removeAttribute('data-capture-target');
+        });
+        panel.setAttribute('data-capture-target', 'true');
+    }
+    return {
+        setupResult,
+        selector: '[data-capture-target="true"]',
+        message: 'Found active results panel'
+    };
+}
+
 // Utility function to restore all hidden elements
 function restoreAllSections() {
     const panel = getResultsPanel();
     if (!panel) return;
 
-    // Remove all inline display styles to restore visibility
-    panel.querySelectorAll('*').forEach(el => {
-        if (el.style.display === 'none' || el.style.display === '') {
-            el.style.removeProperty('display');
+    // Everything the section functions hide carries the .ari-hidden class
+    panel.querySelectorAll('.ari-hidden').forEach(el => el.classList.remove('ari-hidden'));
+
+    console.log('[SECTION] restoreAllSections: Restored all elements');
+}
+'''
+
+
+# Streamlit chrome hidden for clean screenshots. Injected once per capture
+# run; !important so it wins over Streamlit's own emotion classes.
+CAPTURE_CHROME_CSS = """
+[data-testid="stHeader"],
+[data-testid="stDeployButton"],
+[data-testid="stToolbar"] {
+    display: none !important;
+}
+[data-testid="stMainBlockContainer"] {
+    padding-top: 0 !important;
+}
+"""
+
+# Streamlit and BaseWeb tooltips, generic tooltip classes, and the custom
+# tooltips from detailed_metrics.py and learning_tips.py (the "large text
+# blocks" in screenshots)
+TOOLTIP_SELECTOR = ",".join((
+    '[data-testid="stTooltipIcon"]',
+    '[data-testid="stTooltipHoverTarget"]',
+    '[data-testid="tooltipHoverTarget"]',
+    '[class*="tooltip"]',
+    '[class*="Tooltip"]',
+    '[data-baseweb="tooltip"]',
+    '[role="tooltip"]',
+    '.stTooltipIcon',
+    '.stHelp',
+    '.tooltip',
+    '.tooltiptext',
+    '.info-icon',
+    '.tip-bubble',
+    '.tip-content',
+    '.tip-icon',
+    '.tip-title',
+    '.tip-learn-more',
+    # Small icon buttons: Streamlit's hover toolbar (fullscreen etc.) and
+    # Plotly's modebar
+    '[data-testid="stElementToolbar"]',
+    'button[kind="headerNoPadding"]',
+    '.modebar-container',
+))
+
+TOOLTIP_HIDE_CSS = TOOLTIP_SELECTOR + """ {
+    display: none !important;
+    visibility: hidden !important;
+    opacity: 0 !important;
+    height: 0 !important;
+    width: 0 !important;
+    overflow: hidden !important;
+}
+"""
+
+# Section hiding used by SECTION_JS_FUNCTIONS. display:none removes the
+# subtree from layout entirely, so hidden sections neither take space nor add
+# to the vertical block's flex gap.
+SECTION_HIDE_CSS = """
+.ari-hidden {
+    display: none !important;
+}
+"""
+
+# Narrower tooltip rule used by capture_streamlit_sections
+SECTION_TOOLTIP_HIDE_CSS = """
+.tooltip, .tooltiptext, .info-icon,
+.tip-bubble, .tip-content, .tip-icon, .tip-title, .tip-learn-more,
+[data-testid="stTooltipIcon"], [data-testid="stTooltipHoverTarget"],
+[data-baseweb="tooltip"], [role="tooltip"] {
+    display: none !important;
+    visibility: hidden !important;
+}
+"""
+
+# JavaScript helpers for capture_streamlit_tabs, registered as an init script
+# so they exist on every page load
+TAB_JS_FUNCTIONS = '''
+window.__ariPrepTab = async function(idx) {
+    // Click the tab tagged with data-ari-tab-idx and resolve once the switch
+    // has been painted (two animation frames)
+    const tab = document.querySelector(`[data-ari-tab-idx="${idx}"]`);
+    if (!tab) return false;
+    tab.click();
+    await new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(resolve)));
+    return true;
+};
+
+window.__ariExpandHeatmapAbout = function() {
+    // Open the Trend Analysis "About this heatmap" expander if it is collapsed
+    const expanders = document.querySelectorAll('[data-testid="stExpander"]');
+    for (const expander of expanders) {
+        const header = expander.querySelector('summary, [data-testid="stExpanderHeader"]');
+        if (header && header.textContent.includes('About this heatmap')) {
+            // Check if it's collapsed (aria-expanded="false" or similar)
+            const details = expander.querySelector('details');
+            if (details && !details.hasAttribute('open')) {
+                header.click();
+                return true;
+            } else if (!details) {
+                // Try clicking anyway
+                header.click();
+                return true;
+            }
         }
-        if (el.style.visibility === 'hidden') {
-            el.style.removeProperty('visibility');
+    }
+    // Alternative: try finding by text content
+    const allSummaries = document.querySelectorAll('summary');
+    for (const summary of allSummaries) {
+        if (summary.textContent.includes('About this heatmap')) {
+            summary.click();
+            return true;
         }
+    }
+    return false;
+};
+'''
+
+
+_crop_buffers = threading.local()
+
+
+def _png_size(png_bytes: bytes) -> Tuple[int, int]:
+    """Width and height from a PNG's IHDR chunk, without decoding the image."""
+    if png_bytes[:8] == _PNG_SIGNATURE and png_bytes[12:16] == b'IHDR':
+        return struct.unpack('>II', png_bytes[16:24])
+    from PIL import Image
+    with Image.open(io.BytesIO(png_bytes)) as img:
+        return img.size
+
+
+def _screenshot_options(config: Mapping[str, Any]) -> Dict[str, Any]:
+    """Playwright screenshot() encoding options for a section/tab config."""
+    if SCREENSHOT_FORMAT == "jpeg" and config.get("lossy_ok", False):
+        return {'type': 'jpeg', 'quality': JPEG_QUALITY}
+    return {'type': 'png'}
+
+
+def _save_image(img, output, image_format: str) -> None:
+    """Encode a PIL image as PNG (fast zlib level) or JPEG into output."""
+    if image_format == 'JPEG':
+        img.save(output, format='JPEG', quality=JPEG_QUALITY)
+    else:
+        # zlib level 1 encodes several times faster than the default 6;
+        # the PNG only lives long enough to be embedded in the PPTX
+        img.save(output, format='PNG', compress_level=1)
+
+
+def _crop_screenshot(screenshot_bytes: bytes, crop_top: int, crop_bottom: int) -> Tuple[bytes, int, int]:
+    """
+    Trim crop_top/crop_bottom pixels off a PNG or JPEG screenshot.
+
+    Returns:
+        (image_bytes, width, height) in the input's format; the input bytes
+        are returned unchanged when there is nothing (or nothing sensible) to
+        crop
+    """
+    width, height = _png_size(screenshot_bytes)
+
+    if crop_top > 0 or crop_bottom > 0:
+        new_bottom = height - crop_bottom
+        if new_bottom > crop_top:
+            from PIL import Image
+
+            logger.info(f"  Cropping: {height}px -> {new_bottom - crop_top}px")
+            # One output buffer per capture thread, reused across sections;
+            # getvalue() copies, so the returned bytes don't alias it
+            output = getattr(_crop_buffers, 'output', None)
+            if output is None:
+                output = _crop_buffers.output = io.BytesIO()
+            output.seek(0)
+            output.truncate()
+            with Image.open(io.BytesIO(screenshot_bytes)) as img:
+                with img.crop((0, crop_top, width, new_bottom)) as cropped:
+                    _save_image(cropped, output, img.format)
+            return output.getvalue(), width, new_bottom - crop_top
+        logger.warning(f"  Skipping crop: new_bottom ({new_bottom}) <= new_top ({crop_top})")
+
+    return screenshot_bytes, width, height
+
+
+# Requests the capture browser never needs: analytics/telemetry beacons and
+# audio/video. Fonts are left alone because they show up in the screenshots.
+_BLOCKED_RESOURCE_TYPES = frozenset(("media",))
+_BLOCKED_URL_PARTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "segment.io",
+    "segment.com",
+)
+
+
+def _route_capture_request(route) -> None:
+    """Playwright route handler that aborts requests screenshots don't need."""
+    request = route.request
+    url = request.url
+    if request.resource_type in _BLOCKED_RESOURCE_TYPES or any(part in url for part in _BLOCKED_URL_PARTS):
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _save_session_state(session_state: Dict[str, Any], state_file: Path) -> Tuple[List[str], List[str]]:
+    """
+    Write the JSON-serializable part of session_state to state_file for the
+    export-mode app, with has_analyzed forced on.
+
+    The whole state is serialized in one stdlib json pass. Only if that fails
+    is it encoded key by key, to find and skip the non-serializable ones; each
+    encoded entry is written out as-is rather than serialized a second time.
+    The stdlib encoder is used on both paths so the export-mode app gets the
+    same keys and values as before (orjson would also encode datetimes,
+    dataclasses and UUIDs, and write NaN as null).
+
+    Returns:
+        (saved_keys, skipped_keys)
+    """
+    state = dict(session_state)
+    # CRITICAL: Ensure has_analyzed is True so results page is shown
+    state['has_analyzed'] = True
+
+    try:
+        blob = json.dumps(state).encode()
+    except (TypeError, ValueError):
+        pass
+    else:
+        state_file.write_bytes(blob)
+        return list(state), []
+
+    # Encode each item as a one-entry object and keep the inside of it, so a
+    # non-serializable value only drops its own key
+    saved_keys = []
+    skipped_keys = []
+    entries = []
+    for key, value in state.items():
+        try:
+            entry = json.dumps({key: value}).encode()[1:-1]
+        except (TypeError, ValueError):
+            skipped_keys.append(key)
+            logger.debug(f"Skipped non-serializable key: {key} ({type(value).__name__})")
+            continue
+        saved_keys.append(key)
+        entries.append(entry)
+
+    state_file.write_bytes(b'{' + b','.join(entries) + b'}')
+    return saved_keys, skipped_keys
+
+
+# Scrolls the panel matching the selector (and the page) to the top and
+# returns its dimensions and bounding box, or null if there is no such panel
+_PANEL_DIMS_JS = '''selector => {
+    const el = document.querySelector(selector);
+    if (!el) return null;
+    el.scrollTop = 0;
+    window.scrollTo(0, 0);
+    const rect = el.getBoundingClientRect();
+    return {
+        scroll: el.scrollHeight,
+        client: el.clientHeight,
+        docScroll: document.documentElement.scrollHeight,
+        bboxX: rect.x,
+        bboxY: rect.y,
+        width: rect.width,
+        height: rect.height,
+        visible: rect.width > 0 && rect.height > 0
+    };
+}'''
+
+
+# Resolves true once the DOM has gone idleMs without a mutation, or false
+# after timeoutMs
+_DOM_IDLE_JS = '''([idleMs, timeoutMs]) => new Promise(resolve => {
+    let idleTimer;
+    const finish = settled => {
+        observer.disconnect();
+        clearTimeout(idleTimer);
+        clearTimeout(deadline);
+        resolve(settled);
+    };
+    const observer = new MutationObserver(() => {
+        clearTimeout(idleTimer);
+        idleTimer = setTimeout(() => finish(true), idleMs);
     });
+    observer.observe(document.body, {childList: true, subtree: true, attributes: true, characterData: true});
+    idleTimer = setTimeout(() => finish(true), idleMs);
+    const deadline = setTimeout(() => finish(false), timeoutMs);
+})'''
 
-    // Also restore direct children of stVerticalBlock
-    const children = getVerticalBlockChildren(panel);
-    children.forEach(child => {
-        child.style.removeProperty('display');
+
+def _wait_for_dom_idle(page, idle_ms: int = 150, timeout_ms: int = 3000) -> None:
+    """
+    Wait until the page stops mutating its DOM for idle_ms.
+
+    Gives up after timeout_ms, which bounds the wait the same way the fixed
+    sleep it replaces did.
+    """
+    if not page.evaluate(_DOM_IDLE_JS, [idle_ms, timeout_ms]):
+        logger.debug(f"  DOM still changing after {timeout_ms}ms; continuing")
+
+
+# Resolves true once no visible element matches the selector (immediately if
+# none does), false after timeoutMs. Rechecks only when the DOM changes
+# instead of polling.
+_SELECTOR_HIDDEN_JS = '''([selector, timeoutMs]) => new Promise(resolve => {
+    const hidden = () => {
+        const el = document.querySelector(selector);
+        return !el || !el.getClientRects().length || getComputedStyle(el).visibility === 'hidden';
+    };
+    if (hidden()) return resolve(true);
+    const finish = settled => {
+        observer.disconnect();
+        clearTimeout(deadline);
+        resolve(settled);
+    };
+    const observer = new MutationObserver(() => {
+        if (hidden()) finish(true);
     });
+    observer.observe(document.body, {childList: true, subtree: true, attributes: true});
+    const deadline = setTimeout(() => finish(false), timeoutMs);
+})'''
 
-    // Also remove any injected style tags
-    document.querySelectorAll('style[id^="section-visibility"]').forEach(s => s.remove());
-    document.getElementById('hide-tooltips')?.remove();
 
-    console.log('[SECTION] restoreAllSections: Restored all elements');
-}
-'''
+def _wait_for_spinner(page, timeout_ms: int = 5000) -> None:
+    """Wait for any Streamlit loading spinner to go away."""
+    try:
+        if not page.evaluate(_SELECTOR_HIDDEN_JS, ['[data-testid="stSpinner"]', timeout_ms]):
+            logger.debug(f"  Spinner still visible after {timeout_ms}ms; continuing")
+    except Exception as e:
+        logger.debug(f"  Spinner wait failed: {e}")
+
+
+def _wait_for_results(page) -> None:
+    """Wait for the results tabs to render, then for the app to stop rendering."""
+    try:
+        page.wait_for_selector('[data-baseweb="tab-panel"]', timeout=10000)
+    except Exception as e:
+        logger.warning(f"Results tabs did not appear: {e}")
+    _wait_for_dom_idle(page, idle_ms=300, timeout_ms=3000)
+
+
+# Resolves true once the visible tab panel exists and its height is unchanged
+# across two animation frames
+_RENDER_SETTLED_JS = '''() => {
+    const panel = document.querySelector('[data-baseweb="tab-panel"]:not([hidden])')
+        || document.querySelector('[data-baseweb="tab-panel"]');
+    if (!panel) return false;
+    const before = panel.scrollHeight;
+    return new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(
+        () => resolve(panel.scrollHeight === before)
+    )));
+}'''
+
+
+def _wait_for_render(page, fallback_seconds: float, timeout: int = 5000) -> None:
+    """
+    Wait for the visible tab panel to stop changing height.
+
+    Returns as soon as the content has settled rather than after a fixed
+    sleep. If it doesn't settle within timeout ms, sleeps fallback_seconds as
+    the old fixed wait did.
+    """
+    try:
+        page.wait_for_function(_RENDER_SETTLED_JS, timeout=timeout)
+    except Exception as e:
+        logger.debug(f"  Render did not settle ({e}); sleeping {fallback_seconds}s")
+        time.sleep(fallback_seconds)
 
 
 def capture_streamlit_tabs(
@@ -453,8 +955,19 @@ def capture_streamlit_tabs(
     Returns:
         Dict mapping tab name to PNG image bytes
     """
-    from playwright.sync_api import sync_playwright
+    return capture_pool().submit(
+        _capture_tabs, session_state, app_url, tabs_to_capture, viewport_width, viewport_height
+    ).result()
+
 
+def _capture_tabs(
+    session_state: Dict[str, Any],
+    app_url: str,
+    tabs_to_capture: Optional[List[str]],
+    viewport_width: int,
+    viewport_height: int
+) -> Dict[str, bytes]:
+    """capture_streamlit_tabs, run on a capture pool thread."""
     # Default tabs to capture (matches results.py tab structure)
     if tabs_to_capture is None:
         tabs_to_capture = [
@@ -472,55 +985,84 @@ def capture_streamlit_tabs(
     temp_dir.mkdir(exist_ok=True)
     state_file = temp_dir / f"{export_id}.json"
 
-    # Serialize session state (filter out non-serializable items)
-    serializable_state = {}
-    skipped_keys = []
-    for key, value in session_state.items():
-        try:
-            json.dumps(value)  # Test if serializable
-            serializable_state[key] = value
-        except (TypeError, ValueError) as e:
-            skipped_keys.append(key)
-            logger.debug(f"Skipped non-serializable key: {key} ({type(value).__name__})")
-
-    # CRITICAL: Ensure has_analyzed is True so results page is shown
-    serializable_state['has_analyzed'] = True
+    # Serialize session state (non-serializable items are skipped)
+    saved_keys, skipped_keys = _save_session_state(session_state, state_file)
 
-    logger.info(f"Session state: {len(serializable_state)} keys saved, {len(skipped_keys)} skipped")
-    logger.info(f"Saved keys: {list(serializable_state.keys())}")
+    logger.info(f"Session state: {len(saved_keys)} keys saved, {len(skipped_keys)} skipped")
+    logger.info(f"Saved keys: {saved_keys}")
     if skipped_keys:
         logger.warning(f"Skipped keys (non-serializable): {skipped_keys}")
-
-    with open(state_file, 'w') as f:
-        json.dump(serializable_state, f)
     logger.info(f"Saved session state to {state_file}")
 
     screenshots = {}
 
     try:
-        with sync_playwright() as p:
-            # Launch browser
-            logger.info("Launching headless Chromium browser...")
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context(
-                viewport={'width': viewport_width, 'height': viewport_height}
-            )
+        with browser_context(viewport_width, viewport_height) as context:
+            context.add_init_script(script=TAB_JS_FUNCTIONS)
+            context.route("**/*", _route_capture_request)
             page = context.new_page()
 
             # Navigate to app with export mode
             export_url = f"{app_url}?export_mode=true&export_id={export_id}"
             logger.info(f"Navigating to {export_url}")
-            page.goto(export_url, wait_until='networkidle', timeout=60000)
+            # The app is ready when its container renders (waited for below);
+            # networkidle would also wait out any third-party request tail
+            page.goto(export_url, wait_until='domcontentloaded', timeout=60000)
 
             # Wait for Streamlit to fully load
             logger.info("Waiting for Streamlit app to load...")
             page.wait_for_selector('[data-testid="stAppViewContainer"]', timeout=30000)
-            time.sleep(3)  # Additional wait for full rendering
+            _wait_for_results(page)
+
+            # Find all tab buttons, get their text labels, and tag each with its
+            # index so later clicks are a single attribute lookup
+            tab_names_in_page = page.evaluate('''() => {
+                const tabs = document.querySelectorAll('[data-baseweb="tab"]');
+                return Array.from(tabs, (tab, i) => {
+                    tab.dataset.ariTabIdx = i;
+                    return tab.textContent.trim();
+                });
+            }''')
+            logger.info(f"Found {len(tab_names_in_page)} tabs in the app: {tab_names_in_page}")
+
+            # HIDE the tab bar and other UI elements for clean screenshots. Done
+            # once for every tab: hidden elements stay hidden across tab
+            # switches, and tabs are clicked by index tag, which works with the
+            # tab bar hidden. The chrome and tooltip stylesheets do the
+            # hiding; the evaluate only handles what CSS can't express.
+            page.add_style_tag(content=CAPTURE_CHROME_CSS + TOOLTIP_HIDE_CSS)
+            hidden_count = page.evaluate('''tooltipSelector => {
+                // Hide the results tab bar (only the first one; nested tab bars
+                // inside panels stay visible)
+                const tabList = document.querySelector('[data-baseweb="tab-list"]');
+                if (tabList) tabList.style.display = 'none';
+
+                // Count elements for debugging
+                const hiddenCount = document.querySelectorAll(tooltipSelector).length;
+
+                // Hide Streamlit's caption elements that might contain help text
+                document.querySelectorAll('[data-testid="stCaptionContainer"]').forEach(el => {
+                    // Check if this is a help tooltip caption (usually smaller font)
+                    if (el.textContent && el.textContent.length > 200) {
+                        // This might be tooltip help text that expanded
+                        el.style.display = 'none';
+                    }
+                });
+
+                console.log('[SCREENSHOT] Hidden ' + hiddenCount + ' tooltip elements');
+
+                return hiddenCount;
+            }''', TOOLTIP_SELECTOR)
+            logger.info(f"Hidden {hidden_count} tooltip elements")
 
-            # Find all tab buttons and get their text labels
-            tab_buttons = page.query_selector_all('[data-baseweb="tab"]')
-            tab_names_in_page = [btn.inner_text().strip() for btn in tab_buttons]
-            logger.info(f"Found {len(tab_buttons)} tabs in the app: {tab_names_in_page}")
+            # Debug output directory, created once per run
+            debug_dir = _debug_output_dir() if DEBUG_SCREENSHOTS else None
+
+            # Viewport height as last set by this loop, so it never has to be
+            # read back from the page. Each tab sets its base height when it
+            # starts instead of resetting after every capture, so consecutive
+            # tabs at the same height skip the relayout.
+            viewport_h = viewport_height
 
             for i, tab_text in enumerate(tab_names_in_page):
                 # Check if this tab should be captured
@@ -529,429 +1071,155 @@ def capture_streamlit_tabs(
                     continue
 
                 logger.info(f"Capturing tab {i+1}: {tab_text}")
+                shot = _screenshot_options(TAB_SCREENSHOT_CONFIG.get(tab_text, {}))
 
-                # Re-query and click the tab button by finding it fresh each time
-                # This avoids stale element references after DOM changes
-                clicked = page.evaluate(f'''() => {{
-                    const tabs = document.querySelectorAll('[data-baseweb="tab"]');
-                    for (const tab of tabs) {{
-                        if (tab.innerText.trim() === "{tab_text}") {{
-                            tab.click();
-                            return true;
-                        }}
-                    }}
-                    return false;
-                }}''')
+                # Look the tab button up fresh by its index tag each time (this
+                # avoids stale element references after DOM changes) and wait
+                # for the switch to paint, all in one round-trip
+                clicked = page.evaluate('idx => window.__ariPrepTab(idx)', i)
 
                 if not clicked:
                     logger.warning(f"  Could not click tab: {tab_text}")
                     continue
 
-                time.sleep(2)  # Wait for tab content to fully render
+                _wait_for_render(page, 2)  # Wait for tab content to fully render
 
                 # Wait for any loading spinners to disappear
-                try:
-                    page.wait_for_selector('[data-testid="stSpinner"]', state='hidden', timeout=5000)
-                except:
-                    pass  # No spinner or already hidden
+                _wait_for_spinner(page)
 
-                # SPECIAL HANDLING: Force large viewport for Audience Insights EARLY
+                # Start every tab from its base viewport; the panel's measured
+                # scrollHeight sizes it below
                 if tab_text == "Audience Insights":
-                    print("\n" + "="*60)
-                    print(">>> AUDIENCE INSIGHTS: FORCING 3450px VIEWPORT <<<")
-                    print("="*60 + "\n")
-                    logger.info(f"  [AUDIENCE INSIGHTS] Forcing viewport to 3450px height")
-                    page.set_viewport_size({'width': viewport_width, 'height': 3450})
-                    time.sleep(1)
-                    # Scroll to very bottom to trigger all lazy loading
-                    page.evaluate('() => window.scrollTo(0, 99999)')
-                    time.sleep(0.5)
-                    page.evaluate('() => window.scrollTo(0, 0)')
-                    time.sleep(0.5)
+                    base_h = AUDIENCE_INSIGHTS_VIEWPORT_HEIGHT
+                    logger.info(f"  [AUDIENCE INSIGHTS] Setting viewport height to {base_h}px")
+                else:
+                    base_h = viewport_height
+                if viewport_h != base_h:
+                    page.set_viewport_size({'width': viewport_width, 'height': base_h})
+                    viewport_h = base_h
+                    _wait_for_render(page, 1)
 
                 # SPECIAL HANDLING: Expand "About this heatmap" expander for Trend Analysis
                 if tab_text == "Trend Analysis":
                     logger.info(f"  [TREND ANALYSIS] Expanding 'About this heatmap' section")
                     try:
                         # Find and click the expander with "About this heatmap" text
-                        expander_clicked = page.evaluate('''() => {
-                            // Find all expander headers
-                            const expanders = document.querySelectorAll('[data-testid="stExpander"]');
-                            for (const expander of expanders) {
-                                const header = expander.querySelector('summary, [data-testid="stExpanderHeader"]');
-                                if (header && header.textContent.includes('About this heatmap')) {
-                                    // Check if it's collapsed (aria-expanded="false" or similar)
-                                    const details = expander.querySelector('details');
-                                    if (details && !details.hasAttribute('open')) {
-                                        header.click();
-                                        return true;
-                                    } else if (!details) {
-                                        // Try clicking anyway
-                                        header.click();
-                                        return true;
-                                    }
-                                }
-                            }
-                            // Alternative: try finding by text content
-                            const allSummaries = document.querySelectorAll('summary');
-                            for (const summary of allSummaries) {
-                                if (summary.textContent.includes('About this heatmap')) {
-                                    summary.click();
-                                    return true;
-                                }
-                            }
-                            return false;
-                        }''')
+                        expander_clicked = page.evaluate('window.__ariExpandHeatmapAbout()')
                         if expander_clicked:
                             logger.info(f"  [TREND ANALYSIS] Expander clicked, waiting for content to render")
-                            time.sleep(1)  # Wait for expander content to render
+                            _wait_for_render(page, 1)  # Wait for expander content to render
                         else:
                             logger.warning(f"  [TREND ANALYSIS] Could not find 'About this heatmap' expander")
                     except Exception as e:
                         logger.warning(f"  [TREND ANALYSIS] Error expanding section: {e}")
 
-                # HIDE the tab bar and other UI elements for clean screenshot
-                hidden_count = page.evaluate('''() => {
-                    // Hide tab bar
-                    const tabList = document.querySelector('[data-baseweb="tab-list"]');
-                    if (tabList) tabList.style.display = 'none';
-
-                    // Hide Streamlit header/toolbar
-                    const header = document.querySelector('[data-testid="stHeader"]');
-                    if (header) header.style.display = 'none';
-
-                    // Hide deploy button
-                    const deployBtn = document.querySelector('[data-testid="stDeployButton"]');
-                    if (deployBtn) deployBtn.style.display = 'none';
-
-                    // Hide toolbar
-                    const toolbar = document.querySelector('[data-testid="stToolbar"]');
-                    if (toolbar) toolbar.style.display = 'none';
-
-                    // Remove top padding from main container
-                    const mainBlock = document.querySelector('[data-testid="stMainBlockContainer"]');
-                    if (mainBlock) mainBlock.style.paddingTop = '0';
-
-                    // ============================================================
-                    // COMPREHENSIVE TOOLTIP HIDING - Multiple approaches
-                    // ============================================================
-
-                    // 1. Hide all Streamlit tooltip icons (the small info "i" icons)
-                    document.querySelectorAll('[data-testid="stTooltipIcon"]').forEach(el => {
-                        el.style.display = 'none';
-                        el.style.visibility = 'hidden';
-                    });
-
-                    // 2. Hide tooltip hover targets (containers that show tooltips on hover)
-                    document.querySelectorAll('[data-testid="stTooltipHoverTarget"]').forEach(el => {
-                        el.style.display = 'none';
-                    });
-                    document.querySelectorAll('[data-testid="tooltipHoverTarget"]').forEach(el => {
-                        el.style.display = 'none';
-                    });
-
-                    // 3. Hide any elements with class containing "tooltip"
-                    document.querySelectorAll('[class*="tooltip"], [class*="Tooltip"]').forEach(el => {
-                        el.style.display = 'none';
-                    });
-
-                    // 4. Hide BaseWeb tooltips
-                    document.querySelectorAll('[data-baseweb="tooltip"]').forEach(el => {
-                        el.style.display = 'none';
-                    });
-                    document.querySelectorAll('[role="tooltip"]').forEach(el => {
-                        el.style.display = 'none';
-                    });
-
-                    // 5. Hide Streamlit's caption elements that might contain help text
-                    document.querySelectorAll('[data-testid="stCaptionContainer"]').forEach(el => {
-                        // Check if this is a help tooltip caption (usually smaller font)
-                        if (el.textContent && el.textContent.length > 200) {
-                            // This might be tooltip help text that expanded
-                            el.style.display = 'none';
-                        }
-                    });
-
-                    // 6. Hide small SVG icons that are typically info/help icons
-                    document.querySelectorAll('svg').forEach(svg => {
-                        const parent = svg.closest('button, [data-testid="stTooltipIcon"], .stTooltipIcon');
-                        // Check if it's an info icon (usually small, with specific paths)
-                        if (parent && (parent.getAttribute('data-testid') === 'stTooltipIcon' ||
-                            parent.classList.contains('stTooltipIcon'))) {
-                            parent.style.display = 'none';
-                        }
-                        // Also check for standalone info SVGs
-                        const box = svg.getBoundingClientRect();
-                        if (box.width <= 20 && box.height <= 20) {
-                            // Small SVG that could be a help icon
-                            const nearbyText = svg.parentElement?.textContent || '';
-                            if (nearbyText.includes('ⓘ') || svg.innerHTML.includes('circle')) {
-                                svg.style.display = 'none';
-                            }
-                        }
-                    });
-
-                    // 7. Hide elements with specific Streamlit help classes
-                    document.querySelectorAll('.stTooltipIcon, .stHelp').forEach(el => {
-                        el.style.display = 'none';
-                    });
-
-                    // 8. Hide any button that looks like an info button (typically 16-24px square with SVG)
-                    document.querySelectorAll('button').forEach(btn => {
-                        const rect = btn.getBoundingClientRect();
-                        if (rect.width <= 30 && rect.height <= 30 && btn.querySelector('svg')) {
-                            // Small button with SVG - likely info/help button
-                            const svg = btn.querySelector('svg');
-                            if (svg && svg.innerHTML.includes('path')) {
-                                btn.style.visibility = 'hidden';
-                            }
-                        }
-                    });
-
-                    // 9. SPECIFICALLY hide custom tooltip elements from results.py and learning_tips.py
-                    // These are the main culprits showing as "large text blocks"
-
-                    // Count elements for debugging
-                    let hiddenCount = 0;
-
-                    // Hide .tooltip containers and their .tooltiptext content (from detailed_metrics.py)
-                    document.querySelectorAll('.tooltip').forEach(el => {
-                        el.style.display = 'none';
-                        hiddenCount++;
-                    });
-                    document.querySelectorAll('.tooltiptext').forEach(el => {
-                        el.style.display = 'none';
-                        hiddenCount++;
-                    });
-                    document.querySelectorAll('.info-icon').forEach(el => {
-                        el.style.display = 'none';
-                        hiddenCount++;
-                    });
-
-                    // Hide .tip-bubble containers and their content (from learning_tips.py)
-                    document.querySelectorAll('.tip-bubble').forEach(el => {
-                        el.style.display = 'none';
-                        hiddenCount++;
-                    });
-                    document.querySelectorAll('.tip-content').forEach(el => {
-                        el.style.display = 'none';
-                        hiddenCount++;
-                    });
-                    document.querySelectorAll('.tip-icon').forEach(el => {
-                        el.style.display = 'none';
-                        hiddenCount++;
-                    });
-                    document.querySelectorAll('.tip-title').forEach(el => {
-                        el.style.display = 'none';
-                        hiddenCount++;
-                    });
-                    document.querySelectorAll('.tip-learn-more').forEach(el => {
-                        el.style.display = 'none';
-                        hiddenCount++;
-                    });
-
-                    console.log('[SCREENSHOT] Hidden ' + hiddenCount + ' tooltip elements');
-
-                    // 10. Add CSS to force hide ALL tooltip-related elements with !important
-                    const style = document.createElement('style');
-                    style.textContent = `
-                        /* Streamlit built-in tooltips */
-                        [data-testid="stTooltipIcon"],
-                        [data-testid="stTooltipHoverTarget"],
-                        [data-baseweb="tooltip"],
-                        [role="tooltip"],
-                        .stTooltipIcon,
-
-                        /* Custom tooltips from detailed_metrics.py */
-                        .tooltip,
-                        .tooltiptext,
-                        .info-icon,
-
-                        /* Custom tip bubbles from learning_tips.py */
-                        .tip-bubble,
-                        .tip-content,
-                        .tip-icon,
-                        .tip-title,
-                        .tip-learn-more,
-
-                        /* Generic tooltip class patterns */
-                        [class*="tooltip"],
-                        [class*="Tooltip"] {
-                            display: none !important;
-                            visibility: hidden !important;
-                            opacity: 0 !important;
-                            height: 0 !important;
-                            width: 0 !important;
-                            overflow: hidden !important;
-                        }
-                    `;
-                    document.head.appendChild(style);
-
-                    return hiddenCount;
-                }''')
-                logger.info(f"  Hidden {hidden_count} tooltip elements")
-                time.sleep(0.5)
-
                 # Find the active tab panel (the one that's currently visible)
                 # Streamlit shows only the active panel
                 active_panel = page.query_selector('[data-baseweb="tab-panel"]')
 
                 if active_panel:
-                    # Get full scrollable height of the panel content
-                    # For some tabs, we need to get the full document height, not just panel
-                    scroll_height = active_panel.evaluate('el => el.scrollHeight')
-                    client_height = active_panel.evaluate('el => el.clientHeight')
+                    # Scroll to top and read every panel/page dimension in one
+                    # round-trip. bboxY is read after the scroll so it is
+                    # relative to the top of the page.
+                    dims = page.evaluate(_PANEL_DIMS_JS, '[data-baseweb="tab-panel"]')
+                    scroll_height = dims['scroll']
+                    client_height = dims['client']
 
                     # Check if this tab needs full page capture (configured in TAB_SCREENSHOT_CONFIG)
-                    tab_config_temp = TAB_SCREENSHOT_CONFIG.get(tab_text, {})
-                    if tab_config_temp.get("force_full_page", False):
-                        # Scroll to bottom first to ensure all content is loaded (triggers lazy loading)
-                        page.evaluate('() => window.scrollTo(0, document.documentElement.scrollHeight)')
-                        time.sleep(0.5)
-                        # Scroll back to top
-                        page.evaluate('() => window.scrollTo(0, 0)')
-                        time.sleep(0.3)
-
-                        # Get the full page scroll height - don't subtract anything
-                        page_scroll_height = page.evaluate('() => document.documentElement.scrollHeight')
-                        # Use the maximum of panel and page scroll height
+                    # Lazy content is rendered by the viewport resize below, so
+                    # there is no need to scroll to the bottom and back first.
+                    tab_config = TAB_SCREENSHOT_CONFIG.get(tab_text, {})
+                    if tab_config.get("force_full_page", False):
+                        # Use the maximum of panel and page scroll height - don't subtract anything
+                        page_scroll_height = dims['docScroll']
                         scroll_height = max(scroll_height, page_scroll_height)
                         logger.info(f"  {tab_text}: force_full_page=True, page_scroll_height={page_scroll_height}, using {scroll_height}")
 
                     logger.info(f"  Panel dimensions: scrollHeight={scroll_height}, clientHeight={client_height}")
 
-                    # Scroll to top of panel
-                    active_panel.evaluate('element => element.scrollTop = 0')
-                    page.evaluate('() => window.scrollTo(0, 0)')
-                    time.sleep(0.3)
-
                     # Get tab-specific config for viewport sizing
-                    tab_config = TAB_SCREENSHOT_CONFIG.get(tab_text, {})
                     extra_padding = tab_config.get("extra_padding", 200)
 
-                    # Get the current bounding box
-                    bbox = active_panel.bounding_box()
-                    if bbox:
-                        # If content is taller than viewport, resize viewport to fit full content
-                        if scroll_height > client_height:
-                            # Set viewport height to accommodate full content
-                            new_height = int(bbox['y']) + scroll_height + extra_padding
-                            logger.info(f"  Resizing viewport: bbox_y={int(bbox['y'])}, scroll_height={scroll_height}, padding={extra_padding}, new_height={new_height}")
-                            page.set_viewport_size({'width': viewport_width, 'height': new_height})
-                            time.sleep(0.5)  # Wait for re-render
-
-                            # Re-get the panel after viewport resize
-                            active_panel = page.query_selector('[data-baseweb="tab-panel"]')
-                            if active_panel:
-                                active_panel.evaluate('element => element.scrollTop = 0')
-                                page.evaluate('() => window.scrollTo(0, 0)')
-
+                    if dims['visible']:
                         # Check capture mode from config
                         capture_mode = tab_config.get("capture_mode", "panel")
                         min_height = tab_config.get("min_height", 0)
 
-                        # If min_height is specified, ensure viewport is at least that tall
-                        if min_height > 0:
-                            current_viewport = page.viewport_size
-                            if current_viewport and current_viewport['height'] < min_height:
-                                logger.info(f"  Expanding viewport to min_height={min_height}px")
-                                page.set_viewport_size({'width': viewport_width, 'height': min_height})
-                                time.sleep(0.5)
-                                # Scroll to bottom and back to trigger rendering
-                                page.evaluate('() => window.scrollTo(0, document.documentElement.scrollHeight)')
-                                time.sleep(0.3)
-                                page.evaluate('() => window.scrollTo(0, 0)')
-                                time.sleep(0.3)
+                        # If content is taller than viewport, resize viewport to
+                        # fit full content, and to at least min_height, in one
+                        # resize (one relayout)
+                        target_h = viewport_h
+                        if scroll_height > client_height:
+                            # Set viewport height to accommodate full content
+                            bbox_y = int(dims['bboxY'])
+                            target_h = bbox_y + scroll_height + extra_padding
+                            logger.info(f"  Resizing viewport: bbox_y={bbox_y}, scroll_height={scroll_height}, padding={extra_padding}, new_height={target_h}")
+                        if min_height > target_h:
+                            logger.info(f"  Expanding viewport to min_height={min_height}px")
+                            target_h = min_height
+
+                        if target_h != viewport_h:
+                            page.set_viewport_size({'width': viewport_width, 'height': target_h})
+                            viewport_h = target_h
+                            _wait_for_render(page, 0.5)  # Wait for re-render
+
+                            # The element handle survives the resize; just
+                            # scroll the panel back to the top
+                            active_panel.evaluate('element => { element.scrollTop = 0; window.scrollTo(0, 0); }')
 
                         if capture_mode == "full_page":
                             # Capture FULL PAGE screenshot (captures everything visible)
                             logger.info(f"  Using full_page capture mode")
-                            screenshot_bytes = page.screenshot(type='png', full_page=True)
+                            screenshot_bytes = page.screenshot(**shot, full_page=True)
                         else:
                             # Capture the panel element directly (default)
-                            screenshot_bytes = active_panel.screenshot(type='png')
+                            screenshot_bytes = active_panel.screenshot(**shot)
 
                         # Screenshot captured successfully
                         pass
                     else:
                         # Fallback: capture full page
-                        screenshot_bytes = page.screenshot(type='png', full_page=True)
+                        screenshot_bytes = page.screenshot(**shot, full_page=True)
                         logger.info(f"  Fallback: captured full page")
                 else:
                     # Fallback: capture main content area
                     main_content = page.query_selector('[data-testid="stAppViewContainer"]')
                     if main_content:
-                        screenshot_bytes = main_content.screenshot(type='png')
+                        screenshot_bytes = main_content.screenshot(**shot)
                         logger.info(f"  Fallback: captured from main container")
                     else:
-                        screenshot_bytes = page.screenshot(type='png', full_page=True)
+                        screenshot_bytes = page.screenshot(**shot, full_page=True)
                         logger.info(f"  Fallback: captured full page")
 
                 # =================================================================
                 # POST-PROCESS: Apply cropping to ALL screenshots (moved outside conditionals)
                 # =================================================================
-                from PIL import Image
-                import io
-                img = Image.open(io.BytesIO(screenshot_bytes))
-                original_height = img.height
-                original_width = img.width
-
                 # Get tab-specific cropping from configuration
                 tab_crop_config = TAB_SCREENSHOT_CONFIG.get(tab_text, {})
                 crop_top = tab_crop_config.get("crop_top", 0)
                 crop_bottom = tab_crop_config.get("crop_bottom", 0)
 
-                logger.info(f"  Config for '{tab_text}': crop_top={crop_top}px, crop_bottom={crop_bottom}px, original_height={original_height}px")
-
-                # Debug mode: save original screenshot before cropping
-                if DEBUG_SCREENSHOTS:
-                    import os
-                    os.makedirs(DEBUG_OUTPUT_DIR, exist_ok=True)
-                    debug_filename = f"{DEBUG_OUTPUT_DIR}/{tab_text.replace(' ', '_')}_ORIGINAL.png"
-                    with open(debug_filename, 'wb') as f:
-                        f.write(screenshot_bytes)
-                    logger.info(f"  DEBUG: Saved original to {debug_filename}")
+                logger.info(f"  Config for '{tab_text}': crop_top={crop_top}px, crop_bottom={crop_bottom}px")
 
                 # Apply cropping if needed
-                if crop_top > 0 or crop_bottom > 0:
-                    new_top = crop_top
-                    new_bottom = original_height - crop_bottom
-                    if new_bottom > new_top:
-                        logger.info(f"  Cropping: original={original_height}px, new_top={new_top}px, new_bottom={new_bottom}px, final_height={new_bottom - new_top}px")
-                        img = img.crop((0, new_top, original_width, new_bottom))
-                        # Save cropped image back to bytes
-                        output = io.BytesIO()
-                        img.save(output, format='PNG')
-                        screenshot_bytes = output.getvalue()
-
-                        # Debug mode: save cropped screenshot
-                        if DEBUG_SCREENSHOTS:
-                            debug_filename = f"{DEBUG_OUTPUT_DIR}/{tab_text.replace(' ', '_')}_CROPPED.png"
-                            with open(debug_filename, 'wb') as f:
-                                f.write(screenshot_bytes)
-                            logger.info(f"  DEBUG: Saved cropped to {debug_filename}")
-                    else:
-                        logger.warning(f"  Skipping crop: new_bottom ({new_bottom}) <= new_top ({new_top})")
+                cropped_bytes, img_width, img_height = _crop_screenshot(screenshot_bytes, crop_top, crop_bottom)
+
+                # Debug mode: save the original and (if it changed) cropped screenshot
+                if debug_dir:
+                    debug_stem = f"{debug_dir}/{tab_text.replace(' ', '_')}"
+                    debug_files = [(f"{debug_stem}_ORIGINAL.{shot['type']}", screenshot_bytes)]
+                    if cropped_bytes is not screenshot_bytes:
+                        debug_files.append((f"{debug_stem}_CROPPED.{shot['type']}", cropped_bytes))
+                    for debug_filename, debug_bytes in debug_files:
+                        with open(debug_filename, 'wb') as f:
+                            f.write(debug_bytes)
+                        logger.info(f"  DEBUG: Saved {debug_filename}")
+                screenshot_bytes = cropped_bytes
 
                 screenshots[tab_text] = screenshot_bytes
-                logger.info(f"  ✓ Captured {tab_text} ({len(screenshot_bytes):,} bytes, {img.width}x{img.height}px)")
+                logger.info(f"  ✓ Captured {tab_text} ({len(screenshot_bytes):,} bytes, {img_width}x{img_height}px)")
 
-                # Reset viewport for next tab
-                page.set_viewport_size({'width': viewport_width, 'height': viewport_height})
-
-                # RESTORE the tab bar for next iteration (in case we need to click other tabs)
-                page.evaluate('''() => {
-                    const tabList = document.querySelector('[data-baseweb="tab-list"]');
-                    if (tabList) tabList.style.display = '';
-                }''')
-                time.sleep(0.2)
-
-                # ALWAYS reset viewport to default before next tab
-                page.set_viewport_size({'width': viewport_width, 'height': viewport_height})
-                logger.info(f"  Reset viewport to {viewport_width}x{viewport_height} for next tab")
-
-            browser.close()
-            logger.info(f"Browser closed. Total screenshots captured: {len(screenshots)}")
+            logger.info(f"Total screenshots captured: {len(screenshots)}")
 
     except Exception as e:
         logger.error(f"Error capturing tabs: {e}")
@@ -965,6 +1233,276 @@ def capture_streamlit_tabs(
     return screenshots
 
 
+def _group_sections_by_tab(sections: List[str]) -> List[List[str]]:
+    """
+    Group sections by source tab.
+
+    Tabs keep the order of their first section; sections keep their relative
+    order within a tab. Sections without a config form their own group.
+    """
+    by_tab: Dict[str, List[str]] = {}
+    for section_name in sections:
+        config = SECTION_SCREENSHOT_CONFIG.get(section_name)
+        source_tab = config.get("source_tab", section_name) if config else section_name
+        by_tab.setdefault(source_tab, []).append(section_name)
+    return list(by_tab.values())
+
+
+def _partition_sections(sections: List[str], workers: int) -> List[List[str]]:
+    """
+    Split sections into at most `workers` batches for parallel capture.
+
+    A tab's sections always land in the same batch, adjacent to each other,
+    so every batch switches to each of its tabs only once.
+    """
+    tab_groups = _group_sections_by_tab(sections)
+    batches: List[List[str]] = [[] for _ in range(max(1, min(workers, len(tab_groups))))]
+    for i, group in enumerate(tab_groups):
+        batches[i % len(batches)].extend(group)
+    return [batch for batch in batches if batch]
+
+
+def _capture_section_batch(
+    section_names: List[str],
+    app_url: str,
+    export_id: str,
+    viewport_width: int,
+    viewport_height: int
+) -> Dict[str, bytes]:
+    """
+    Capture one batch of sections in its own browser context.
+
+    section_names must already be grouped by source tab (see
+    _partition_sections). The export-mode state file for export_id must exist.
+    """
+    # Crop/encode futures by section; PNG encoding runs on encode_pool while
+    # the browser moves on to the next section
+    pending = {}
+
+    with browser_context(viewport_width, viewport_height) as context, \
+            ThreadPoolExecutor(max_workers=2, thread_name_prefix="section-encode") as encode_pool:
+        # Register the section visibility functions once; Chromium parses
+        # them when the document is created and they survive tab switches
+        # (Streamlit tabs don't navigate)
+        context.add_init_script(script=SECTION_JS_FUNCTIONS)
+        context.route("**/*", _route_capture_request)
+        page = context.new_page()
+
+        # Navigate to app with export mode
+        export_url = f"{app_url}?export_mode=true&export_id={export_id}"
+        logger.info(f"Navigating to {export_url}")
+        # The app is ready when its container renders (waited for below);
+        # networkidle would also wait out any third-party request tail
+        page.goto(export_url, wait_until='domcontentloaded', timeout=60000)
+
+        # Wait for Streamlit to fully load
+        logger.info("Waiting for Streamlit app to load...")
+        page.wait_for_selector('[data-testid="stAppViewContainer"]', timeout=30000)
+        _wait_for_results(page)
+
+        # Tag the results tabs container once for the section functions
+        page.evaluate('tagResultsTabs()')
+
+        # Hide the Streamlit chrome and tooltips once for every section, and
+        # define the class the section functions hide children with
+        page.add_style_tag(content=CAPTURE_CHROME_CSS + SECTION_TOOLTIP_HIDE_CSS + SECTION_HIDE_CSS)
+
+        # Get all available tabs (this also builds the lookup clickTab uses)
+        tab_names_in_page = page.evaluate('listTabs()')
+        logger.info(f"Found {len(tab_names_in_page)} tabs in the app: {tab_names_in_page}")
+
+        # Track current tab to avoid unnecessary tab switches
+        current_tab = None
+        # Viewport height as last set by this loop, so it never has to be read
+        # back from the page. Each section sets its base height when it starts
+        # instead of resetting after every capture, so consecutive sections at
+        # the same height skip the relayout.
+        viewport_h = viewport_height
+
+        # Capture each tab's sections back to back so every tab is
+        # switched to (and its DOM re-prepared) only once
+        for section_name in section_names:
+            section_config = SECTION_SCREENSHOT_CONFIG.get(section_name)
+            if not section_config:
+                logger.warning(f"No config found for section: {section_name}")
+                continue
+
+            source_tab = section_config.get("source_tab", section_name)
+            js_setup = section_config.get("js_setup")
+            shot = _screenshot_options(section_config)
+
+            logger.info(f"Capturing section: {section_name} (source tab: {source_tab})")
+
+            # Switch to source tab if needed
+            if current_tab != source_tab:
+                logger.info(f"  Switching to tab: {source_tab}")
+                clicked = page.evaluate('name => clickTab(name)', source_tab)
+
+                if not clicked:
+                    logger.warning(f"  Could not click tab: {source_tab}")
+                    continue
+
+                _wait_for_render(page, 2)
+                current_tab = source_tab
+
+                # Wait for any loading spinners
+                _wait_for_spinner(page)
+
+            # Special handling for specific tabs/sections
+            if source_tab == "Audience Insights":
+                # Force large viewport for full content
+                base_h = section_config.get("min_height", AUDIENCE_INSIGHTS_VIEWPORT_HEIGHT)
+                logger.info(f"  [AUDIENCE INSIGHTS] Setting viewport height to {base_h}px")
+            else:
+                base_h = viewport_height
+            if viewport_h != base_h:
+                page.set_viewport_size({'width': viewport_width, 'height': base_h})
+                viewport_h = base_h
+                _wait_for_render(page, 1)
+
+            if source_tab == "Trend Analysis":
+                # Expand "About this heatmap" section
+                logger.info(f"  [TREND ANALYSIS] Expanding 'About this heatmap' section")
+                page.evaluate('''() => {
+                    const allSummaries = document.querySelectorAll('summary');
+                    for (const summary of allSummaries) {
+                        if (summary.textContent.includes('About this heatmap')) {
+                            summary.click();
+                            return true;
+                        }
+                    }
+                    return false;
+                }''')
+                _wait_for_render(page, 1)
+
+            # Restore all sections, apply section-specific visibility (if
+            # js_setup is defined), hide the tab bar and find the active tab
+            # panel from the RESULTS tabs, all in one round-trip
+            if js_setup:
+                logger.info(f"  Applying visibility function: {js_setup}()")
+            panel_info = page.evaluate('jsSetup => prepareSection(jsSetup)', js_setup)
+            if js_setup:
+                logger.info(f"  {js_setup}() returned: {panel_info.get('setupResult')}")
+            _wait_for_render(page, 0.5)
+
+            # Get config for viewport sizing
+            extra_padding = section_config.get("extra_padding", 200)
+            capture_mode = section_config.get("capture_mode", "panel")
+            min_height = section_config.get("min_height", 0)
+
+            logger.info(f"  [DEBUG] Panel info: {panel_info}")
+            panel_selector = panel_info.get('selector', '[data-baseweb="tab-panel"]')
+            logger.info(f"  Panel selector: {panel_selector}")
+            dims = page.evaluate(_PANEL_DIMS_JS, panel_selector)
+
+            if dims:
+                scroll_height = dims['scroll']
+                client_height = dims['client']
+
+                # FALLBACK: If panel has zero dimensions, the JS hiding went wrong
+                # Restore and try full page capture
+                if scroll_height == 0 or client_height == 0:
+                    logger.warning(f"  Panel has zero dimensions! Restoring and using full page capture...")
+                    # Re-apply JS setup more carefully
+                    if js_setup:
+                        logger.info(f"  Re-applying {js_setup}() after restore...")
+                    page.evaluate('jsSetup => prepareSection(jsSetup)', js_setup)
+                    _wait_for_render(page, 0.5)
+                    # Get new dimensions
+                    dims = page.evaluate(_PANEL_DIMS_JS, panel_selector) or dims
+                    scroll_height = dims['scroll']
+                    client_height = dims['client']
+                    logger.info(f"  After restore - Panel dimensions: scrollHeight={scroll_height}, clientHeight={client_height}")
+                    # If still zero, use full page capture
+                    if scroll_height == 0 or client_height == 0:
+                        logger.warning(f"  Still zero dimensions - using full page capture")
+                        screenshot_bytes = page.screenshot(**shot, full_page=True)
+                        # Apply cropping and continue
+                        pending[section_name] = encode_pool.submit(
+                            _crop_screenshot,
+                            screenshot_bytes,
+                            section_config.get("crop_top", 0),
+                            section_config.get("crop_bottom", 0)
+                        )
+                        logger.info(f"  ✓ Captured {section_name} (full page fallback)")
+                        continue  # Skip to next section
+
+                if section_config.get("force_full_page", False):
+                    scroll_height = max(scroll_height, dims['docScroll'])
+
+                logger.info(f"  Panel dimensions: scrollHeight={scroll_height}, clientHeight={client_height}")
+
+                # Fit the full panel content and min_height in a single
+                # resize (one relayout)
+                target_h = viewport_h
+                if dims['visible'] and scroll_height > client_height:
+                    target_h = int(dims['bboxY']) + scroll_height + extra_padding
+                    logger.info(f"  Resizing viewport to {target_h}px")
+                if min_height > target_h:
+                    logger.info(f"  Expanding viewport to min_height={min_height}px")
+                    target_h = min_height
+
+                if target_h != viewport_h:
+                    page.set_viewport_size({'width': viewport_width, 'height': target_h})
+                    viewport_h = target_h
+                    _wait_for_render(page, 0.5)
+                    # Scroll back to the top using the CORRECT selector (the
+                    # one we used initially); the re-read box is used below
+                    dims = page.evaluate(_PANEL_DIMS_JS, panel_selector) or dims
+
+                if capture_mode == "full_page":
+                    logger.info(f"  Using full_page capture mode")
+                    screenshot_bytes = page.screenshot(**shot, full_page=True)
+                elif dims['visible']:
+                    # Clip the panel straight from the page with the box
+                    # measured above (no element lookup), folding
+                    # crop_top/crop_bottom into the clip so nothing needs a
+                    # Pillow crop afterwards
+                    crop_top = section_config.get("crop_top", 0)
+                    crop_bottom = section_config.get("crop_bottom", 0)
+                    clip_width = int(round(dims['width']))
+                    clip_height = int(round(dims['height'])) - crop_top - crop_bottom
+                    if clip_height <= 0:
+                        logger.warning(f"  Skipping crop: crops ({crop_top}+{crop_bottom}px) exceed panel height")
+                        crop_top = crop_bottom = 0
+                        clip_height = int(round(dims['height']))
+                    clip_y = dims['bboxY'] + crop_top
+
+                    screenshot_bytes = page.screenshot(**shot, clip={
+                        'x': dims['bboxX'],
+                        'y': clip_y,
+                        'width': clip_width,
+                        'height': clip_height
+                    })
+                    # Already cropped; this only reads the size back
+                    pending[section_name] = encode_pool.submit(_crop_screenshot, screenshot_bytes, 0, 0)
+                    logger.info(f"  ✓ Captured {section_name} ({len(screenshot_bytes):,} bytes raw)")
+                    continue
+                else:
+                    screenshot_bytes = page.screenshot(**shot, full_page=True)
+                    logger.info(f"  Panel not visible: captured full page")
+            else:
+                screenshot_bytes = page.screenshot(**shot, full_page=True)
+                logger.info(f"  Fallback: captured full page")
+
+            # Apply cropping
+            crop_top = section_config.get("crop_top", 0)
+            crop_bottom = section_config.get("crop_bottom", 0)
+            logger.info(f"  Config: crop_top={crop_top}px, crop_bottom={crop_bottom}px")
+            pending[section_name] = encode_pool.submit(_crop_screenshot, screenshot_bytes, crop_top, crop_bottom)
+            logger.info(f"  ✓ Captured {section_name} ({len(screenshot_bytes):,} bytes raw)")
+
+        # Collect the crops/encodes that overlapped with the browser work
+        screenshots = {}
+        for section_name, future in pending.items():
+            screenshot_bytes, img_width, img_height = future.result()
+            screenshots[section_name] = screenshot_bytes
+            logger.info(f"  {section_name}: {len(screenshot_bytes):,} bytes, {img_width}x{img_height}px")
+        logger.info(f"Total sections captured: {len(screenshots)}")
+
+    return screenshots
+
+
 def capture_streamlit_sections(
     session_state: Dict[str, Any],
     app_url: str = "http://localhost:3006",
@@ -991,8 +1529,6 @@ def capture_streamlit_sections(
     logger.info("SECTION CAPTURE VERSION: 2024-01-06-v4 (fix Psychographic title + Emerging cropping)")
     logger.info("=" * 60)
 
-    from playwright.sync_api import sync_playwright
-
     # Default sections to capture (8 sections from 4 tabs)
     if sections_to_capture is None:
         sections_to_capture = [
@@ -1012,374 +1548,26 @@ def capture_streamlit_sections(
     temp_dir.mkdir(exist_ok=True)
     state_file = temp_dir / f"{export_id}.json"
 
-    # Serialize session state (filter out non-serializable items)
-    serializable_state = {}
-    skipped_keys = []
-    for key, value in session_state.items():
-        try:
-            json.dumps(value)
-            serializable_state[key] = value
-        except (TypeError, ValueError):
-            skipped_keys.append(key)
-            logger.debug(f"Skipped non-serializable key: {key} ({type(value).__name__})")
-
-    serializable_state['has_analyzed'] = True
-
-    logger.info(f"Session state: {len(serializable_state)} keys saved, {len(skipped_keys)} skipped")
+    # Serialize session state (non-serializable items are skipped)
+    saved_keys, skipped_keys = _save_session_state(session_state, state_file)
 
-    with open(state_file, 'w') as f:
-        json.dump(serializable_state, f)
+    logger.info(f"Session state: {len(saved_keys)} keys saved, {len(skipped_keys)} skipped")
     logger.info(f"Saved session state to {state_file}")
 
     screenshots = {}
 
     try:
-        with sync_playwright() as p:
-            logger.info("Launching headless Chromium browser for section capture...")
-
-            # Launch browser
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context(
-                viewport={'width': viewport_width, 'height': viewport_height}
-            )
-            page = context.new_page()
-
-            # Navigate to app with export mode
-            export_url = f"{app_url}?export_mode=true&export_id={export_id}"
-            logger.info(f"Navigating to {export_url}")
-            page.goto(export_url, wait_until='networkidle', timeout=60000)
-
-            # Wait for Streamlit to fully load
-            logger.info("Waiting for Streamlit app to load...")
-            page.wait_for_selector('[data-testid="stAppViewContainer"]', timeout=30000)
-            time.sleep(3)
-
-            # Inject the section visibility JavaScript functions
-            logger.info("Injecting section visibility JavaScript functions...")
-            page.evaluate(SECTION_JS_FUNCTIONS)
-
-            # Get all available tabs
-            tab_buttons = page.query_selector_all('[data-baseweb="tab"]')
-            tab_names_in_page = [btn.inner_text().strip() for btn in tab_buttons]
-            logger.info(f"Found {len(tab_buttons)} tabs in the app: {tab_names_in_page}")
-
-            # Track current tab to avoid unnecessary tab switches
-            current_tab = None
-
-            for section_name in sections_to_capture:
-                section_config = SECTION_SCREENSHOT_CONFIG.get(section_name)
-                if not section_config:
-                    logger.warning(f"No config found for section: {section_name}")
-                    continue
-
-                source_tab = section_config.get("source_tab", section_name)
-                js_setup = section_config.get("js_setup")
-
-                logger.info(f"Capturing section: {section_name} (source tab: {source_tab})")
-
-                # Switch to source tab if needed
-                if current_tab != source_tab:
-                    logger.info(f"  Switching to tab: {source_tab}")
-                    clicked = page.evaluate(f'''() => {{
-                        const tabs = document.querySelectorAll('[data-baseweb="tab"]');
-                        for (const tab of tabs) {{
-                            if (tab.innerText.trim() === "{source_tab}") {{
-                                tab.click();
-                                return true;
-                            }}
-                        }}
-                        return false;
-                    }}''')
-
-                    if not clicked:
-                        logger.warning(f"  Could not click tab: {source_tab}")
-                        continue
-
-                    time.sleep(2)
-                    current_tab = source_tab
-
-                    # Wait for any loading spinners
-                    try:
-                        page.wait_for_selector('[data-testid="stSpinner"]', state='hidden', timeout=5000)
-                    except:
-                        pass
-
-                    # Re-inject JS functions after tab switch (DOM might have changed)
-                    page.evaluate(SECTION_JS_FUNCTIONS)
-
-                # Special handling for specific tabs/sections
-                if source_tab == "Audience Insights":
-                    # Force large viewport for full content
-                    min_height = section_config.get("min_height", 2500)
-                    logger.info(f"  [AUDIENCE INSIGHTS] Setting viewport height to {min_height}px")
-                    page.set_viewport_size({'width': viewport_width, 'height': min_height})
-                    time.sleep(1)
-                    # Scroll to trigger lazy loading
-                    page.evaluate('() => window.scrollTo(0, 99999)')
-                    time.sleep(0.5)
-                    page.evaluate('() => window.scrollTo(0, 0)')
-                    time.sleep(0.5)
-
-                if source_tab == "Trend Analysis":
-                    # Expand "About this heatmap" section
-                    logger.info(f"  [TREND ANALYSIS] Expanding 'About this heatmap' section")
-                    page.evaluate('''() => {
-                        const allSummaries = document.querySelectorAll('summary');
-                        for (const summary of allSummaries) {
-                            if (summary.textContent.includes('About this heatmap')) {
-                                summary.click();
-                                return true;
-                            }
-                        }
-                        return false;
-                    }''')
-                    time.sleep(1)
-
-                # Restore all sections before applying new visibility rules
-                page.evaluate('restoreAllSections()')
-                time.sleep(0.3)
-
-                # Apply section-specific visibility (if js_setup is defined)
-                if js_setup:
-                    logger.info(f"  Applying visibility function: {js_setup}()")
-                    result = page.evaluate(f'{js_setup}()')
-                    logger.info(f"  {js_setup}() returned: {result}")
-                    time.sleep(0.5)
-
-                # HIDE the tab bar and other UI elements for clean screenshot
-                page.evaluate('''() => {
-                    const tabList = document.querySelector('[data-baseweb="tab-list"]');
-                    if (tabList) tabList.style.display = 'none';
-                    const header = document.querySelector('[data-testid="stHeader"]');
-                    if (header) header.style.display = 'none';
-                    const toolbar = document.querySelector('[data-testid="stToolbar"]');
-                    if (toolbar) toolbar.style.display = 'none';
-                    const mainBlock = document.querySelector('[data-testid="stMainBlockContainer"]');
-                    if (mainBlock) mainBlock.style.paddingTop = '0';
-                }''')
-
-                # Hide tooltips
-                page.evaluate('''() => {
-                    const style = document.createElement('style');
-                    style.id = 'hide-tooltips';
-                    style.textContent = `
-                        .tooltip, .tooltiptext, .info-icon,
-                        .tip-bubble, .tip-content, .tip-icon, .tip-title, .tip-learn-more,
-                        [data-testid="stTooltipIcon"], [data-testid="stTooltipHoverTarget"],
-                        [data-baseweb="tooltip"], [role="tooltip"] {
-                            display: none !important;
-                            visibility: hidden !important;
-                        }
-                    `;
-                    if (!document.getElementById('hide-tooltips')) {
-                        document.head.appendChild(style);
-                    }
-                }''')
-                time.sleep(0.3)
-
-                # Get config for viewport sizing
-                extra_padding = section_config.get("extra_padding", 200)
-                capture_mode = section_config.get("capture_mode", "panel")
-                min_height = section_config.get("min_height", 0)
-
-                # Find the active tab panel from the RESULTS tabs
-                # In export mode: allTabs[0] = Results (no Upload/Paste tabs)
-                # In normal mode: allTabs[1] = Results
-                # We identify results tabs by looking for "Detailed Metrics" tab button
-                logger.info(f"  [DEBUG] Looking for results panel for section: {section_name}")
-                panel_info = page.evaluate('''() => {
-                    // First, clear any previous capture-target markers
-                    document.querySelectorAll('[data-capture-target]').forEach(el => {
-                        el.removeAttribute('data-capture-target');
-                    });
-
-                    const allTabs = document.querySelectorAll('[data-testid="stTabs"]');
-                    const debugInfo = {
-                        totalStTabs: allTabs.length,
-                        selector: '[data-baseweb="tab-panel"]',
-                        message: ''
-                    };
-
-                    if (allTabs.length === 0) {
-                        debugInfo.message = 'No stTabs found, using first tab-panel';
-                        return debugInfo;
-                    }
-
-                    // Find which stTabs contains the "Detailed Metrics" tab
-                    let resultsTabs = null;
-                    let resultsTabsIndex = -1;
-                    for (let i = 0; i < allTabs.length; i++) {
-                        const tabButtons = allTabs[i].querySelectorAll('[data-baseweb="tab"]');
-                        for (const btn of tabButtons) {
-                            if (btn.innerText.includes('Detailed Metrics')) {
-                                resultsTabs = allTabs[i];
-                                resultsTabsIndex = i;
-                                break;
-                            }
-                        }
-                        if (resultsTabs) break;
-                    }
-
-                    if (!resultsTabs) {
-                        debugInfo.message = 'Could not find results tabs by content, using first stTabs';
-                        resultsTabs = allTabs[0];
-                        resultsTabsIndex = 0;
-                    }
-
-                    debugInfo.resultsTabsIndex = resultsTabsIndex;
-                    const panels = resultsTabs.querySelectorAll(':scope > div > [role="tabpanel"]');
-                    debugInfo.totalPanels = panels.length;
-
-                    for (let i = 0; i < panels.length; i++) {
-                        if (!panels[i].hasAttribute('hidden')) {
-                            // Mark this panel with a unique ID for selection
-                            panels[i].setAttribute('data-capture-target', 'true');
-                            debugInfo.selector = '[data-capture-target="true"]';
-                            debugInfo.message = 'Found active results panel at stTabs[' + resultsTabsIndex + '], panel index ' + i;
-                            debugInfo.panelIndex = i;
-                            return debugInfo;
-                        }
-                    }
-
-                    debugInfo.message = 'No active panel in results tabs';
-                    return debugInfo;
-                }''')
-                logger.info(f"  [DEBUG] Panel info: {panel_info}")
-                panel_selector = panel_info.get('selector', '[data-baseweb="tab-panel"]')
-                logger.info(f"  Panel selector: {panel_selector}")
-                active_panel = page.query_selector(panel_selector)
-
-                if active_panel:
-                    scroll_height = active_panel.evaluate('el => el.scrollHeight')
-                    client_height = active_panel.evaluate('el => el.clientHeight')
-
-                    # FALLBACK: If panel has zero dimensions, the JS hiding went wrong
-                    # Restore and try full page capture
-                    if scroll_height == 0 or client_height == 0:
-                        logger.warning(f"  Panel has zero dimensions! Restoring and using full page capture...")
-                        page.evaluate('restoreAllSections()')
-                        time.sleep(0.5)
-                        # Re-apply JS setup more carefully
-                        if js_setup:
-                            logger.info(f"  Re-applying {js_setup}() after restore...")
-                            page.evaluate(f'{js_setup}()')
-                            time.sleep(0.5)
-                        # Get new dimensions
-                        scroll_height = active_panel.evaluate('el => el.scrollHeight')
-                        client_height = active_panel.evaluate('el => el.clientHeight')
-                        logger.info(f"  After restore - Panel dimensions: scrollHeight={scroll_height}, clientHeight={client_height}")
-                        # If still zero, use full page capture
-                        if scroll_height == 0 or client_height == 0:
-                            logger.warning(f"  Still zero dimensions - using full page capture")
-                            screenshot_bytes = page.screenshot(type='png', full_page=True)
-                            # Apply cropping and continue
-                            from PIL import Image
-                            import io
-                            img = Image.open(io.BytesIO(screenshot_bytes))
-                            original_height = img.height
-                            original_width = img.width
-                            crop_top = section_config.get("crop_top", 0)
-                            crop_bottom = section_config.get("crop_bottom", 0)
-                            logger.info(f"  Config: crop_top={crop_top}px, crop_bottom={crop_bottom}px, original_height={original_height}px")
-                            if crop_top > 0 or crop_bottom > 0:
-                                new_top = crop_top
-                                new_bottom = original_height - crop_bottom
-                                if new_bottom > new_top:
-                                    logger.info(f"  Cropping: {original_height}px -> {new_bottom - new_top}px")
-                                    img = img.crop((0, new_top, original_width, new_bottom))
-                                    output = io.BytesIO()
-                                    img.save(output, format='PNG')
-                                    screenshot_bytes = output.getvalue()
-                            screenshots[section_name] = screenshot_bytes
-                            logger.info(f"  ✓ Captured {section_name} (full page fallback) ({len(screenshot_bytes):,} bytes)")
-                            page.set_viewport_size({'width': viewport_width, 'height': viewport_height})
-                            page.evaluate('''() => {
-                                const tabList = document.querySelector('[data-baseweb="tab-list"]');
-                                if (tabList) tabList.style.display = '';
-                            }''')
-                            time.sleep(0.2)
-                            continue  # Skip to next section
-
-                    if section_config.get("force_full_page", False):
-                        page.evaluate('() => window.scrollTo(0, document.documentElement.scrollHeight)')
-                        time.sleep(0.3)
-                        page.evaluate('() => window.scrollTo(0, 0)')
-                        time.sleep(0.3)
-                        page_scroll_height = page.evaluate('() => document.documentElement.scrollHeight')
-                        scroll_height = max(scroll_height, page_scroll_height)
-
-                    logger.info(f"  Panel dimensions: scrollHeight={scroll_height}, clientHeight={client_height}")
-
-                    active_panel.evaluate('element => element.scrollTop = 0')
-                    page.evaluate('() => window.scrollTo(0, 0)')
-                    time.sleep(0.3)
-
-                    bbox = active_panel.bounding_box()
-                    if bbox and scroll_height > client_height:
-                        new_height = int(bbox['y']) + scroll_height + extra_padding
-                        logger.info(f"  Resizing viewport to {new_height}px")
-                        page.set_viewport_size({'width': viewport_width, 'height': new_height})
-                        time.sleep(0.5)
-                        # Re-query using the CORRECT selector (the one we used initially)
-                        active_panel = page.query_selector(panel_selector)
-                        logger.info(f"  Re-queried panel with selector: {panel_selector}")
-                        if active_panel:
-                            active_panel.evaluate('element => element.scrollTop = 0')
-                            page.evaluate('() => window.scrollTo(0, 0)')
-
-                    if min_height > 0:
-                        current_viewport = page.viewport_size
-                        if current_viewport and current_viewport['height'] < min_height:
-                            logger.info(f"  Expanding viewport to min_height={min_height}px")
-                            page.set_viewport_size({'width': viewport_width, 'height': min_height})
-                            time.sleep(0.5)
-
-                    if capture_mode == "full_page":
-                        logger.info(f"  Using full_page capture mode")
-                        screenshot_bytes = page.screenshot(type='png', full_page=True)
-                    else:
-                        screenshot_bytes = active_panel.screenshot(type='png')
-                else:
-                    screenshot_bytes = page.screenshot(type='png', full_page=True)
-                    logger.info(f"  Fallback: captured full page")
-
-                # Apply cropping
-                from PIL import Image
-                import io
-                img = Image.open(io.BytesIO(screenshot_bytes))
-                original_height = img.height
-                original_width = img.width
-
-                crop_top = section_config.get("crop_top", 0)
-                crop_bottom = section_config.get("crop_bottom", 0)
-
-                logger.info(f"  Config: crop_top={crop_top}px, crop_bottom={crop_bottom}px, original_height={original_height}px")
-
-                if crop_top > 0 or crop_bottom > 0:
-                    new_top = crop_top
-                    new_bottom = original_height - crop_bottom
-                    if new_bottom > new_top:
-                        logger.info(f"  Cropping: {original_height}px -> {new_bottom - new_top}px")
-                        img = img.crop((0, new_top, original_width, new_bottom))
-                        output = io.BytesIO()
-                        img.save(output, format='PNG')
-                        screenshot_bytes = output.getvalue()
-
-                screenshots[section_name] = screenshot_bytes
-                logger.info(f"  ✓ Captured {section_name} ({len(screenshot_bytes):,} bytes, {img.width}x{img.height}px)")
-
-                # Reset viewport for next section
-                page.set_viewport_size({'width': viewport_width, 'height': viewport_height})
-
-                # Restore tab bar for next iteration
-                page.evaluate('''() => {
-                    const tabList = document.querySelector('[data-baseweb="tab-list"]');
-                    if (tabList) tabList.style.display = '';
-                }''')
-                time.sleep(0.2)
-
-            browser.close()
-            logger.info(f"Browser closed. Total sections captured: {len(screenshots)}")
+        # Each batch runs on its own capture pool thread, with that thread's
+        # browser (the sync API is bound to the thread that started it)
+        batches = _partition_sections(sections_to_capture, SECTION_CAPTURE_WORKERS)
+        logger.info(f"Capturing {len(sections_to_capture)} sections in {len(batches)} parallel browsers")
+        pool = capture_pool()
+        futures = [
+            pool.submit(_capture_section_batch, batch, app_url, export_id, viewport_width, viewport_height)
+            for batch in batches
+        ]
+        for future in futures:
+            screenshots.update(future.result())
 
     except Exception as e:
         logger.error(f"Error capturing sections: {e}")
@@ -1389,7 +1577,8 @@ def capture_streamlit_sections(
         if state_file.exists():
             state_file.unlink()
 
-    return screenshots
+    # Return in the requested order, which is the slide order
+    return {name: screenshots[name] for name in sections_to_capture if name in screenshots}
 
 
 def capture_tab_content_as_html(
@@ -1405,14 +1594,33 @@ def capture_tab_content_as_html(
         tab_name: Name of the tab to render
 
     Returns:
-        PNG image bytes or None if rendering fails
+        PNG image bytes, or None if the tab has no data or rendering fails
+    """
+    scores, brand_name = _normalize_fallback_state(session_state)
+    return _capture_tab_html(session_state, scores, brand_name, tab_name, _fallback_signature(session_state))
+
+
+def _capture_tab_html(
+    session_state: Dict[str, Any],
+    scores: Dict[str, Any],
+    brand_name: str,
+    tab_name: str,
+    signature: Optional[str] = None
+) -> Optional[bytes]:
+    """
+    capture_tab_content_as_html for scores/brand_name already normalized by
+    _normalize_fallback_state. signature (from _fallback_signature) lets the
+    generated HTML be reused across calls; None disables the cache.
     """
-    from playwright.sync_api import sync_playwright
+    required = _REQUIRED_KEYS.get(tab_name)
+    if required and not any(session_state.get(key) for key in required):
+        logger.info(f"Skipping {tab_name}: no data in session state ({', '.join(required)})")
+        return None
 
     logger.info(f"Generating HTML for tab: {tab_name}")
 
     # Generate HTML based on tab name
-    html_content = _generate_tab_html(session_state, tab_name)
+    html_content = _cached_tab_html(session_state, scores, brand_name, tab_name, signature)
     if not html_content:
         logger.warning(f"No HTML template available for tab: {tab_name}")
         return None
@@ -1420,35 +1628,420 @@ def capture_tab_content_as_html(
     logger.debug(f"Generated HTML content ({len(html_content):,} chars)")
 
     try:
-        with sync_playwright() as p:
-            logger.info(f"Launching browser to render {tab_name}...")
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page(viewport={'width': 1920, 'height': 1080})
+        logger.info(f"Rendering {tab_name} in the capture browser...")
+        screenshot_bytes = capture_pool().submit(_render_html, html_content).result()
+        logger.info(f"  ✓ Rendered {tab_name} ({len(screenshot_bytes):,} bytes)")
+        return screenshot_bytes
 
-            # Load HTML content
-            page.set_content(html_content)
-            time.sleep(1)  # Wait for rendering
+    except Exception as e:
+        logger.error(f"Error rendering HTML for {tab_name}: {e}")
+        return None
 
-            # Capture screenshot
-            screenshot_bytes = page.screenshot(type='png', full_page=True)
-            logger.info(f"  ✓ Rendered {tab_name} ({len(screenshot_bytes):,} bytes)")
 
-            browser.close()
-            return screenshot_bytes
+def _render_html(html_content: str) -> bytes:
+    """Full-page PNG of an HTML document, run on a capture pool thread."""
+    with browser_context(1920, 1080) as context:
+        page = context.new_page()
 
-    except Exception as e:
-        logger.error(f"Error rendering HTML for {tab_name}: {e}")
+        # Load HTML content
+        page.set_content(html_content)
+        _wait_for_dom_idle(page, timeout_ms=1000)  # Wait for rendering
+
+        # Capture screenshot
+        return page.screenshot(type='png', full_page=True)
+
+
+# =============================================================================
+# HTML FALLBACK STYLES - Static CSS for _generate_tab_html
+# =============================================================================
+# Built once at import; each template only drops these into its <head>.
+
+_BASE_STYLES = """
+<style>
+    body {
+        font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+        background: #f8fafc;
+        padding: 40px;
+        margin: 0;
+        color: #1e293b;
+    }
+    .container {
+        max-width: 1400px;
+        margin: 0 auto;
+        background: white;
+        border-radius: 12px;
+        padding: 40px;
+        box-shadow: 0 4px 12px rgba(0,0,0,0.08);
+    }
+    .title {
+        font-size: 32px;
+        font-weight: 700;
+        color: #6171EA;
+        margin-bottom: 30px;
+        border-bottom: 3px solid #6171EA;
+        padding-bottom: 15px;
+    }
+    .metric-card {
+        background: #f8fafc;
+        border-radius: 8px;
+        padding: 20px;
+        margin-bottom: 20px;
+    }
+    .metric-name {
+        font-size: 16px;
+        font-weight: 600;
+        color: #334155;
+        margin-bottom: 10px;
+    }
+    .metric-bar {
+        height: 24px;
+        background: #e2e8f0;
+        border-radius: 12px;
+        overflow: hidden;
+    }
+    .metric-fill {
+        height: 100%;
+        background: linear-gradient(90deg, #6171EA, #10b981);
+        border-radius: 12px;
+        transition: width 0.3s ease;
+    }
+    .metric-value {
+        font-size: 24px;
+        font-weight: 700;
+        color: #6171EA;
+        margin-top: 8px;
+    }
+    .grid {
+        display: grid;
+        grid-template-columns: repeat(2, 1fr);
+        gap: 20px;
+    }
+</style>
+"""
+
+# Body text used by the list-style tabs
+_DESC_STYLES = """
+<style>
+    .audience-desc {
+        font-size: 16px;
+        line-height: 1.6;
+        color: #475569;
+    }
+</style>
+"""
+
+# Audience Insights
+_AUDIENCE_STYLES = """
+<style>
+    .audience-section {
+        margin-bottom: 30px;
+        padding: 25px;
+        background: #f8fafc;
+        border-radius: 12px;
+        border-left: 4px solid #6171EA;
+    }
+    .audience-title {
+        font-size: 20px;
+        font-weight: 600;
+        color: #6171EA;
+        margin-bottom: 15px;
+    }
+    .audience-desc {
+        font-size: 16px;
+        line-height: 1.6;
+        color: #475569;
+    }
+</style>
+"""
+
+# Trend Analysis
+_TREND_STYLES = """
+<style>
+    .audience-desc {
+        font-size: 16px;
+        line-height: 1.6;
+        color: #475569;
+    }
+    .benchmark {
+        background: linear-gradient(90deg, #6171EA, #10b981);
+        color: white;
+        padding: 20px;
+        border-radius: 12px;
+        margin-top: 30px;
+        text-align: center;
+    }
+    .benchmark-value {
+        font-size: 48px;
+        font-weight: 700;
+    }
+</style>
+"""
+
+# Competitor Tactics
+_COMPETITOR_STYLES = """
+<style>
+    .audience-desc {
+        font-size: 16px;
+        line-height: 1.6;
+        color: #475569;
+    }
+    .strategy-header {
+        background: linear-gradient(90deg, #6171EA, #3b82f6);
+        color: white;
+        padding: 15px 20px;
+        border-radius: 8px;
+        margin-bottom: 20px;
+        font-size: 18px;
+        font-weight: 600;
+    }
+</style>
+"""
+
+# Score Card
+_SCORECARD_STYLES = """
+<style>
+    .kpi-grid {
+        display: grid;
+        grid-template-columns: repeat(3, 1fr);
+        gap: 20px;
+        margin-top: 30px;
+    }
+    .kpi-box {
+        padding: 20px;
+        border-radius: 12px;
+        text-align: center;
+    }
+    .kpi-box.strength { background: #e0f7ec; border: 2px solid #10b981; }
+    .kpi-box.opportunity { background: #fff4e5; border: 2px solid #f59e0b; }
+    .kpi-box.roi { background: #fef2f2; border: 2px solid #ef4444; }
+    .kpi-title {
+        font-weight: 600;
+        font-size: 14px;
+        margin-bottom: 10px;
+    }
+    .kpi-value {
+        font-size: 16px;
+        line-height: 1.4;
+    }
+</style>
+"""
+
+# Psychographic Highlights & Audience Summary
+_PSYCHOGRAPHIC_STYLES = """
+<style>
+    .audience-section {
+        margin-bottom: 25px;
+        padding: 20px;
+        background: #f8fafc;
+        border-radius: 12px;
+        border-left: 4px solid #6171EA;
+    }
+    .audience-title {
+        font-size: 18px;
+        font-weight: 600;
+        color: #6171EA;
+        margin-bottom: 10px;
+    }
+    .audience-desc {
+        font-size: 16px;
+        line-height: 1.6;
+        color: #475569;
+    }
+</style>
+"""
+
+# Growth Audience Insights
+_SEGMENT_STYLES = """
+<style>
+    .segments-grid {
+        display: grid;
+        grid-template-columns: repeat(2, 1fr);
+        gap: 30px;
+    }
+    .segment-card {
+        padding: 25px;
+        border-radius: 12px;
+        border: 2px solid;
+        background: white;
+    }
+    .segment-label {
+        display: inline-block;
+        color: white;
+        padding: 4px 12px;
+        border-radius: 20px;
+        font-size: 12px;
+        font-weight: 600;
+        margin-bottom: 15px;
+    }
+    .segment-name {
+        font-size: 20px;
+        font-weight: 700;
+        color: #1e293b;
+        margin-bottom: 12px;
+    }
+    .segment-desc {
+        font-size: 15px;
+        line-height: 1.6;
+        color: #475569;
+    }
+</style>
+"""
+
+# Emerging Audience Opportunity
+_EMERGING_STYLES = """
+<style>
+    .emerging-box {
+        padding: 30px;
+        border-left: 4px solid #5865f2;
+        background: #f5f7ff;
+        border-radius: 12px;
+    }
+    .emerging-title {
+        font-size: 24px;
+        font-weight: 700;
+        color: #4338ca;
+        margin-bottom: 15px;
+    }
+    .emerging-desc {
+        font-size: 16px;
+        line-height: 1.6;
+        color: #475569;
+        font-style: italic;
+        margin-bottom: 20px;
+    }
+    .detail-section {
+        margin-top: 15px;
+    }
+    .detail-section strong {
+        color: #334155;
+    }
+</style>
+"""
+
+
+def _page_template(styles: str, body: str) -> str:
+    """
+    Build a fallback page as a %-template at import time.
+
+    body is the markup inside <body>, with %s slots for the dynamic values
+    (literal percent signs written as %%). The static CSS is escaped for %,
+    so the result only needs those slots filled per render.
+    """
+    return (
+        '<!DOCTYPE html>\n<html>\n<head>' + styles.replace('%', '%%') + '</head>\n'
+        '<body>\n' + body + '\n</body>\n</html>\n'
+    )
+
+
+def _text(value: Any) -> str:
+    """HTML-escaped str(value), for interpolating session values into a fallback page."""
+    return escape(str(value))
+
+
+# Escaped card title per score key. Score keys are the fixed metric names,
+# so this fills once and every later lookup is a plain dict hit.
+_DISPLAY_NAMES: Dict[str, str] = {}
+
+
+def _display_name(name: str) -> str:
+    """Escaped card title for a score key, e.g. 'cultural_relevance' -> 'Cultural Relevance'."""
+    display = _DISPLAY_NAMES.get(name)
+    if display is None:
+        display = _DISPLAY_NAMES.setdefault(name, escape(name.replace('_', ' ').title()))
+    return display
+
+
+def _numeric_scores(scores: Dict[str, Any]) -> List[Tuple[str, Any]]:
+    """(escaped display name, value) for each int/float score, in dict order; other values are skipped."""
+    return [
+        (_display_name(str(name)), value)
+        for name, value in scores.items()
+        if isinstance(value, (int, float))
+    ]
+
+
+# Session keys read by the fallback page builders; the HTML cache signature
+# covers exactly these, so keep it in step with the _build_* functions
+_FALLBACK_STATE_KEYS = (
+    'scores', 'brand_name', 'audiences', 'media_affinities', 'ai_insights',
+    'percentile', 'next_steps', 'recommendations', 'competitor_tactics',
+    'audience_summary', 'pychographic_highlights', 'audience_segments',
+)
+
+# Session keys each fallback page is built from. A page whose keys are all
+# empty would only show placeholders, so it is skipped before HTML generation.
+_REQUIRED_KEYS: Dict[str, Tuple[str, ...]] = {
+    "Detailed Metrics": ('scores',),
+    "Audience Insights": ('audiences',),
+    "Media Affinities": ('media_affinities',),
+    "Trend Analysis": ('ai_insights', 'percentile'),
+    "Next Steps": ('next_steps', 'recommendations'),
+    "Competitor Tactics": ('competitor_tactics',),
+    "Score Card": ('ai_insights',),
+    "Executive Summary & Detailed Metrics": ('ai_insights', 'scores'),
+    "Advanced Metric Analysis": ('scores',),
+    "Psychographic Highlights & Audience Summary": ('audience_summary', 'pychographic_highlights'),
+    "Growth Audience Insights": ('audience_segments',),
+    "Emerging Audience Opportunity": ('audience_segments',),
+}
+
+# Generated fallback HTML by (tab_name, signature), least recently used first
+_HTML_CACHE_SIZE = 64
+_html_cache: "OrderedDict[Tuple[str, str], Optional[str]]" = OrderedDict()
+_html_cache_lock = threading.Lock()
+
+
+def _fallback_signature(session_state: Dict[str, Any]) -> Optional[str]:
+    """
+    Digest of the session values the fallback pages read.
+
+    Returns:
+        Hex digest, or None when a value isn't plain JSON data (the HTML is
+        then generated without caching)
+    """
+    present = [(key, session_state[key]) for key in _FALLBACK_STATE_KEYS if key in session_state]
+    try:
+        encoded = json.dumps(present).encode('utf-8')
+    except (TypeError, ValueError):
         return None
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
 
 
-def _generate_tab_html(session_state: Dict[str, Any], tab_name: str) -> Optional[str]:
+def _cached_tab_html(
+    session_state: Dict[str, Any],
+    scores: Dict[str, Any],
+    brand_name: str,
+    tab_name: str,
+    signature: Optional[str]
+) -> Optional[str]:
+    """_generate_tab_html, memoized on (tab_name, signature) when there is a signature."""
+    if signature is None:
+        return _generate_tab_html(session_state, scores, brand_name, tab_name)
+
+    key = (tab_name, signature)
+    with _html_cache_lock:
+        if key in _html_cache:
+            _html_cache.move_to_end(key)
+            return _html_cache[key]
+
+    html_content = _generate_tab_html(session_state, scores, brand_name, tab_name)
+    with _html_cache_lock:
+        _html_cache[key] = html_content
+        if len(_html_cache) > _HTML_CACHE_SIZE:
+            _html_cache.popitem(last=False)
+    return html_content
+
+
+def _normalize_fallback_state(session_state: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
     """
-    Generate static HTML for a tab based on session state.
+    Type-check the session values shared by every fallback page.
 
-    This creates a simplified HTML representation of the tab content
-    that can be rendered to an image.
+    Done once per capture run so the per-tab builders can trust their inputs.
+
+    Returns:
+        (scores, brand_name): scores is always a dict and brand_name an
+        HTML-escaped str
     """
-    # Safely get values with type checking
     scores = session_state.get('scores', {})
     if not isinstance(scores, dict):
         scores = {}
@@ -1457,677 +2050,445 @@ def _generate_tab_html(session_state: Dict[str, Any], tab_name: str) -> Optional
     if not isinstance(brand_name, str):
         brand_name = str(brand_name) if brand_name else 'Brand'
 
+    return scores, escape(brand_name)
+
+
+def _generate_tab_html(
+    session_state: Dict[str, Any],
+    scores: Dict[str, Any],
+    brand_name: str,
+    tab_name: str
+) -> Optional[str]:
+    """
+    Generate static HTML for a tab based on session state.
+
+    This creates a simplified HTML representation of the tab content
+    that can be rendered to an image. scores and brand_name come from
+    _normalize_fallback_state.
+    """
     logger.debug(f"Generating HTML for {tab_name} with {len(scores)} metrics")
 
-    # Common styles
-    styles = """
-    <style>
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: #f8fafc;
-            padding: 40px;
-            margin: 0;
-            color: #1e293b;
-        }
-        .container {
-            max-width: 1400px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 12px;
-            padding: 40px;
-            box-shadow: 0 4px 12px rgba(0,0,0,0.08);
-        }
-        .title {
-            font-size: 32px;
-            font-weight: 700;
-            color: #6171EA;
-            margin-bottom: 30px;
-            border-bottom: 3px solid #6171EA;
-            padding-bottom: 15px;
-        }
-        .metric-card {
-            background: #f8fafc;
-            border-radius: 8px;
-            padding: 20px;
-            margin-bottom: 20px;
-        }
-        .metric-name {
-            font-size: 16px;
-            font-weight: 600;
-            color: #334155;
-            margin-bottom: 10px;
-        }
-        .metric-bar {
-            height: 24px;
-            background: #e2e8f0;
-            border-radius: 12px;
-            overflow: hidden;
-        }
-        .metric-fill {
-            height: 100%;
-            background: linear-gradient(90deg, #6171EA, #10b981);
-            border-radius: 12px;
-            transition: width 0.3s ease;
-        }
-        .metric-value {
-            font-size: 24px;
-            font-weight: 700;
-            color: #6171EA;
-            margin-top: 8px;
-        }
-        .grid {
-            display: grid;
-            grid-template-columns: repeat(2, 1fr);
-            gap: 20px;
-        }
-    </style>
+    builder = _TAB_BUILDERS.get(tab_name)
+    if builder is None:
+        return None
+    return builder(session_state, scores, brand_name)
+
+
+_DETAILED_METRICS_PAGE = _page_template(_BASE_STYLES, """\
+    <div class="container">
+        <div class="title">Detailed Metrics - %s</div>
+        <div class="grid">
+            %s
+        </div>
+    </div>""")
+
+
+# Two-stage: the name is filled per score schema, then width/value per render
+_METRIC_CARD = '<div class="metric-card"><div class="metric-name">%s</div><div class="metric-bar"><div class="metric-fill" style="width: %%s%%%%"></div></div><div class="metric-value">%%.1f</div></div>'
+
+
+@lru_cache(maxsize=64)
+def _metric_cards_template(names: Tuple[Any, ...]) -> str:
     """
+    Detailed Metrics card list for one score schema, as a %-template.
 
-    if tab_name == "Detailed Metrics":
-        metrics_html = ""
-        for metric_name, value in scores.items():
-            try:
-                if isinstance(value, (int, float)):
-                    # Ensure metric_name is a string
-                    name_str = str(metric_name) if not isinstance(metric_name, str) else metric_name
-                    display_name = name_str.replace('_', ' ').title()
-                    percentage = min(100, max(0, value))
-                    metrics_html += f"""
-                    <div class="metric-card">
-                        <div class="metric-name">{display_name}</div>
-                        <div class="metric-bar">
-                            <div class="metric-fill" style="width: {percentage}%"></div>
-                        </div>
-                        <div class="metric-value">{value:.1f}</div>
-                    </div>
-                    """
-            except Exception as e:
-                logger.warning(f"Skipping metric {metric_name}: {e}")
-
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>{styles}</head>
-        <body>
-            <div class="container">
-                <div class="title">Detailed Metrics - {brand_name}</div>
-                <div class="grid">
-                    {metrics_html}
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-
-    elif tab_name == "Audience Insights":
-        audiences = session_state.get('audiences', {})
-        core = audiences.get('core', 'Core audience description not available')
-        primary = audiences.get('primary', 'Primary audience description not available')
-        secondary = audiences.get('secondary', 'Secondary audience description not available')
-
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>{styles}
-        <style>
-            .audience-section {{
-                margin-bottom: 30px;
-                padding: 25px;
-                background: #f8fafc;
-                border-radius: 12px;
-                border-left: 4px solid #6171EA;
-            }}
-            .audience-title {{
-                font-size: 20px;
-                font-weight: 600;
-                color: #6171EA;
-                margin-bottom: 15px;
-            }}
-            .audience-desc {{
-                font-size: 16px;
-                line-height: 1.6;
-                color: #475569;
-            }}
-        </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="title">Audience Insights - {brand_name}</div>
-                <div class="audience-section">
-                    <div class="audience-title">🎯 Core Audience</div>
-                    <div class="audience-desc">{core}</div>
-                </div>
-                <div class="audience-section">
-                    <div class="audience-title">👥 Primary Audience</div>
-                    <div class="audience-desc">{primary}</div>
-                </div>
-                <div class="audience-section">
-                    <div class="audience-title">🌐 Secondary Audience</div>
-                    <div class="audience-desc">{secondary}</div>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-
-    elif tab_name == "Media Affinities":
-        media_affinities = session_state.get('media_affinities', [])
-
-        media_html = ""
-        for i, item in enumerate(media_affinities[:10]):
-            if isinstance(item, dict):
-                site = item.get('site', f'Site {i+1}')
-                qvi = item.get('qvi', 0)
-                media_html += f"""
-                <div class="metric-card">
-                    <div class="metric-name">{site}</div>
-                    <div class="metric-bar">
-                        <div class="metric-fill" style="width: {min(100, qvi)}%"></div>
-                    </div>
-                    <div class="metric-value">QVI: {qvi:.1f}</div>
-                </div>
-                """
-
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>{styles}</head>
-        <body>
-            <div class="container">
-                <div class="title">Media Affinities - {brand_name}</div>
-                {media_html if media_html else '<p>No media affinity data available</p>'}
-            </div>
-        </body>
-        </html>
-        """
-
-    elif tab_name == "Trend Analysis":
-        # Get trend data from session state
-        ai_insights = session_state.get('ai_insights', {})
-        improvements = ai_insights.get('improvements', []) if isinstance(ai_insights, dict) else []
-        percentile = session_state.get('percentile', 50)
-
-        trends_html = ""
-        if improvements:
-            for imp in improvements[:5]:
-                if isinstance(imp, dict):
-                    area = imp.get('area', '')
-                    rec = imp.get('recommendation', '')
-                    trends_html += f"""
-                    <div class="metric-card">
-                        <div class="metric-name">{area}</div>
-                        <div class="audience-desc">{rec}</div>
-                    </div>
-                    """
-
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>{styles}
-        <style>
-            .audience-desc {{
-                font-size: 16px;
-                line-height: 1.6;
-                color: #475569;
-            }}
-            .benchmark {{
-                background: linear-gradient(90deg, #6171EA, #10b981);
-                color: white;
-                padding: 20px;
-                border-radius: 12px;
-                margin-top: 30px;
-                text-align: center;
-            }}
-            .benchmark-value {{
-                font-size: 48px;
-                font-weight: 700;
-            }}
-        </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="title">Marketing Trend Analysis - {brand_name}</div>
-                <h3 style="color: #334155; margin-bottom: 20px;">Strategic Recommendations</h3>
-                {trends_html if trends_html else '<p>No trend data available</p>'}
-                <div class="benchmark">
-                    <div>Benchmark Ranking</div>
-                    <div class="benchmark-value">Top {percentile}%</div>
-                    <div>of all campaigns analyzed</div>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-
-    elif tab_name == "Next Steps":
-        next_steps = session_state.get('next_steps', session_state.get('recommendations', []))
-
-        steps_html = ""
-        if isinstance(next_steps, list):
-            for i, step in enumerate(next_steps[:5], 1):
-                steps_html += f"""
-                <div class="metric-card">
-                    <div class="metric-name">Step {i}</div>
-                    <div class="audience-desc">{step}</div>
-                </div>
-                """
-        elif isinstance(next_steps, str):
-            steps_html = f'<div class="metric-card"><div class="audience-desc">{next_steps}</div></div>'
-
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>{styles}
-        <style>
-            .audience-desc {{
-                font-size: 16px;
-                line-height: 1.6;
-                color: #475569;
-            }}
-        </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="title">Recommended Next Steps - {brand_name}</div>
-                {steps_html if steps_html else '<p>No recommendations available</p>'}
-            </div>
-        </body>
-        </html>
-        """
-
-    elif tab_name == "Competitor Tactics":
-        competitor_tactics = session_state.get('competitor_tactics', [])
-
-        tactics_html = ""
-        if isinstance(competitor_tactics, list) and len(competitor_tactics) > 0:
-            for i, tactic in enumerate(competitor_tactics, 1):
-                # Handle tactics that might be formatted as "Header: Content"
-                if isinstance(tactic, str):
-                    if ':' in tactic:
-                        parts = tactic.split(':', 1)
-                        header = parts[0].strip()
-                        content = parts[1].strip() if len(parts) > 1 else ''
-                        tactics_html += f"""
-                        <div class="metric-card">
-                            <div class="metric-name">{header}</div>
-                            <div class="audience-desc">{content}</div>
-                        </div>
-                        """
-                    else:
-                        tactics_html += f"""
-                        <div class="metric-card">
-                            <div class="metric-name">Strategy {i}</div>
-                            <div class="audience-desc">{tactic}</div>
-                        </div>
-                        """
-
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>{styles}
-        <style>
-            .audience-desc {{
-                font-size: 16px;
-                line-height: 1.6;
-                color: #475569;
-            }}
-            .strategy-header {{
-                background: linear-gradient(90deg, #6171EA, #3b82f6);
-                color: white;
-                padding: 15px 20px;
-                border-radius: 8px;
-                margin-bottom: 20px;
-                font-size: 18px;
-                font-weight: 600;
-            }}
-        </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="title">Competitor Strategy Analysis - {brand_name}</div>
-                <div class="strategy-header">Fortune 500 Counter-Strategy Recommendations</div>
-                {tactics_html if tactics_html else '<p>No competitor tactics generated. Enter a competitor brand to generate strategies.</p>'}
-            </div>
-        </body>
-        </html>
-        """
-
-    # =========================================================================
-    # NEW SECTION-BASED TEMPLATES (for 8-slide export)
-    # =========================================================================
-
-    elif tab_name == "Score Card":
-        # Score Card: Title + Radar summary + KPI boxes
-        ai_insights = session_state.get('ai_insights', {})
-        top_strength = ai_insights.get('top_strength', 'N/A') if isinstance(ai_insights, dict) else 'N/A'
-        key_opportunity = ai_insights.get('key_opportunity', 'N/A') if isinstance(ai_insights, dict) else 'N/A'
-        roi_potential = ai_insights.get('roi_potential', 'N/A') if isinstance(ai_insights, dict) else 'N/A'
-
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>{styles}
-        <style>
-            .kpi-grid {{
-                display: grid;
-                grid-template-columns: repeat(3, 1fr);
-                gap: 20px;
-                margin-top: 30px;
-            }}
-            .kpi-box {{
-                padding: 20px;
-                border-radius: 12px;
-                text-align: center;
-            }}
-            .kpi-box.strength {{ background: #e0f7ec; border: 2px solid #10b981; }}
-            .kpi-box.opportunity {{ background: #fff4e5; border: 2px solid #f59e0b; }}
-            .kpi-box.roi {{ background: #fef2f2; border: 2px solid #ef4444; }}
-            .kpi-title {{
-                font-weight: 600;
-                font-size: 14px;
-                margin-bottom: 10px;
-            }}
-            .kpi-value {{
-                font-size: 16px;
-                line-height: 1.4;
-            }}
-        </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="title">Audience Resonance Index Scorecard - {brand_name}</div>
-                <div class="kpi-grid">
-                    <div class="kpi-box strength">
-                        <div class="kpi-title">Top Strength</div>
-                        <div class="kpi-value">{top_strength}</div>
-                    </div>
-                    <div class="kpi-box opportunity">
-                        <div class="kpi-title">Key Opportunity</div>
-                        <div class="kpi-value">{key_opportunity}</div>
-                    </div>
-                    <div class="kpi-box roi">
-                        <div class="kpi-title">KPI Potential</div>
-                        <div class="kpi-value">{roi_potential}</div>
-                    </div>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-
-    elif tab_name == "Executive Summary & Detailed Metrics":
-        ai_insights = session_state.get('ai_insights', {})
-        summary = ai_insights.get('summary', 'Executive summary not available') if isinstance(ai_insights, dict) else 'Executive summary not available'
-
-        metrics_html = ""
-        for metric_name, value in scores.items():
-            try:
-                if isinstance(value, (int, float)):
-                    name_str = str(metric_name) if not isinstance(metric_name, str) else metric_name
-                    display_name = name_str.replace('_', ' ').title()
-                    percentage = min(100, max(0, value * 10))
-                    color = "#10b981" if value >= 8 else "#f59e0b" if value >= 6 else "#ef4444"
-                    metrics_html += f"""
-                    <div class="metric-card">
-                        <div class="metric-name">{display_name}</div>
-                        <div class="metric-bar">
-                            <div class="metric-fill" style="width: {percentage}%; background: {color};"></div>
-                        </div>
-                        <div class="metric-value" style="color: {color};">{value:.1f}</div>
-                    </div>
-                    """
-            except Exception:
-                pass
-
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>{styles}</head>
-        <body>
-            <div class="container">
-                <div class="title">Executive Summary & Detailed Metrics - {brand_name}</div>
-                <h3 style="color: #334155;">Executive Summary</h3>
-                <p style="font-size: 16px; line-height: 1.6; margin-bottom: 30px;">{summary}</p>
-                <h3 style="color: #334155;">Detailed Metrics</h3>
-                <div class="grid">
-                    {metrics_html}
-                </div>
+    The display names are baked in as literals, leaving a (width, value)
+    slot pair per card, so a report rerendered with the same score keys only
+    formats its numbers.
+    """
+    return ''.join([
+        _METRIC_CARD % (_display_name(str(name)).replace('%', '%%'),)
+        for name in names
+    ])
+
+
+def _build_detailed_metrics(session_state: Dict[str, Any], scores: Dict[str, Any], brand_name: str) -> str:
+    """Detailed Metrics: one bar card per numeric score."""
+    names = []
+    fills = []
+    for name, value in scores.items():
+        if isinstance(value, (int, float)):
+            names.append(name)
+            fills += (min(100, max(0, value)), value)
+    metrics_html = _metric_cards_template(tuple(names)) % tuple(fills)
+
+    return _DETAILED_METRICS_PAGE % (brand_name, metrics_html)
+
+
+_AUDIENCE_INSIGHTS_PAGE = _page_template(_BASE_STYLES + _AUDIENCE_STYLES, """\
+    <div class="container">
+        <div class="title">Audience Insights - %s</div>
+        <div class="audience-section">
+            <div class="audience-title">🎯 Core Audience</div>
+            <div class="audience-desc">%s</div>
+        </div>
+        <div class="audience-section">
+            <div class="audience-title">👥 Primary Audience</div>
+            <div class="audience-desc">%s</div>
+        </div>
+        <div class="audience-section">
+            <div class="audience-title">🌐 Secondary Audience</div>
+            <div class="audience-desc">%s</div>
+        </div>
+    </div>""")
+
+
+def _build_audience_insights(session_state: Dict[str, Any], scores: Dict[str, Any], brand_name: str) -> str:
+    """Audience Insights: core, primary and secondary audience descriptions."""
+    audiences = session_state.get('audiences', {})
+    core = audiences.get('core', 'Core audience description not available')
+    primary = audiences.get('primary', 'Primary audience description not available')
+    secondary = audiences.get('secondary', 'Secondary audience description not available')
+
+    return _AUDIENCE_INSIGHTS_PAGE % (brand_name, _text(core), _text(primary), _text(secondary))
+
+
+_MEDIA_AFFINITIES_PAGE = _page_template(_BASE_STYLES, """\
+    <div class="container">
+        <div class="title">Media Affinities - %s</div>
+        %s
+    </div>""")
+_EMPTY_MEDIA = '<p>No media affinity data available</p>'
+
+
+_MEDIA_CARD = '<div class="metric-card"><div class="metric-name">%s</div><div class="metric-bar"><div class="metric-fill" style="width: %s%%"></div></div><div class="metric-value">QVI: %.1f</div></div>'
+
+
+def _build_media_affinities(session_state: Dict[str, Any], scores: Dict[str, Any], brand_name: str) -> str:
+    """Media Affinities: QVI bar cards for the top 10 sites."""
+    media_affinities = session_state.get('media_affinities', [])
+
+    media_parts = []
+    for i, item in enumerate(media_affinities[:10]):
+        if isinstance(item, dict):
+            site = item.get('site', f'Site {i+1}')
+            qvi = item.get('qvi', 0)
+            media_parts.append(_MEDIA_CARD % (_text(site), min(100, qvi), qvi))
+    media_html = ''.join(media_parts) or _EMPTY_MEDIA
+
+    return _MEDIA_AFFINITIES_PAGE % (brand_name, media_html)
+
+
+_TREND_ANALYSIS_PAGE = _page_template(_BASE_STYLES + _TREND_STYLES, """\
+    <div class="container">
+        <div class="title">Marketing Trend Analysis - %s</div>
+        <h3 style="color: #334155; margin-bottom: 20px;">Strategic Recommendations</h3>
+        %s
+        <div class="benchmark">
+            <div>Benchmark Ranking</div>
+            <div class="benchmark-value">Top %s%%</div>
+            <div>of all campaigns analyzed</div>
+        </div>
+    </div>""")
+_EMPTY_TRENDS = '<p>No trend data available</p>'
+
+
+_TEXT_CARD = '<div class="metric-card"><div class="metric-name">%s</div><div class="audience-desc">%s</div></div>'
+
+
+def _build_trend_analysis(session_state: Dict[str, Any], scores: Dict[str, Any], brand_name: str) -> str:
+    """Trend Analysis: strategic recommendations and the benchmark ranking."""
+    # Get trend data from session state
+    ai_insights = session_state.get('ai_insights', {})
+    improvements = ai_insights.get('improvements', []) if isinstance(ai_insights, dict) else []
+    percentile = session_state.get('percentile', 50)
+
+    trends_parts = []
+    if improvements:
+        for imp in improvements[:5]:
+            if isinstance(imp, dict):
+                area = _text(imp.get('area', ''))
+                rec = _text(imp.get('recommendation', ''))
+                trends_parts.append(_TEXT_CARD % (area, rec))
+    trends_html = ''.join(trends_parts) or _EMPTY_TRENDS
+
+    return _TREND_ANALYSIS_PAGE % (
+        brand_name,
+        trends_html,
+        _text(percentile),
+    )
+
+
+_NEXT_STEPS_PAGE = _page_template(_BASE_STYLES + _DESC_STYLES, """\
+    <div class="container">
+        <div class="title">Recommended Next Steps - %s</div>
+        %s
+    </div>""")
+_EMPTY_STEPS = '<p>No recommendations available</p>'
+
+
+_DESC_CARD = '<div class="metric-card"><div class="audience-desc">%s</div></div>'
+
+
+def _build_next_steps(session_state: Dict[str, Any], scores: Dict[str, Any], brand_name: str) -> str:
+    """Next Steps: up to five recommended steps."""
+    next_steps = session_state.get('next_steps', session_state.get('recommendations', []))
+
+    steps_parts = []
+    if isinstance(next_steps, list):
+        for i, step in enumerate(map(_text, next_steps[:5]), 1):
+            steps_parts.append(_TEXT_CARD % ('Step %d' % i, step))
+    elif isinstance(next_steps, str):
+        steps_parts.append(_DESC_CARD % escape(next_steps))
+    steps_html = ''.join(steps_parts) or _EMPTY_STEPS
+
+    return _NEXT_STEPS_PAGE % (brand_name, steps_html)
+
+
+_COMPETITOR_TACTICS_PAGE = _page_template(_BASE_STYLES + _COMPETITOR_STYLES, """\
+    <div class="container">
+        <div class="title">Competitor Strategy Analysis - %s</div>
+        <div class="strategy-header">Fortune 500 Counter-Strategy Recommendations</div>
+        %s
+    </div>""")
+_EMPTY_TACTICS = '<p>No competitor tactics generated. Enter a competitor brand to generate strategies.</p>'
+
+
+def _build_competitor_tactics(session_state: Dict[str, Any], scores: Dict[str, Any], brand_name: str) -> str:
+    """Competitor Tactics: one card per counter-strategy."""
+    competitor_tactics = session_state.get('competitor_tactics', [])
+
+    tactics_parts = []
+    if isinstance(competitor_tactics, list) and len(competitor_tactics) > 0:
+        for i, tactic in enumerate(competitor_tactics, 1):
+            # Handle tactics that might be formatted as "Header: Content"
+            if isinstance(tactic, str):
+                if ':' in tactic:
+                    parts = tactic.split(':', 1)
+                    header = escape(parts[0].strip())
+                    content = escape(parts[1].strip()) if len(parts) > 1 else ''
+                    tactics_parts.append(_TEXT_CARD % (header, content))
+                else:
+                    tactics_parts.append(_TEXT_CARD % ('Strategy %d' % i, escape(tactic)))
+    tactics_html = ''.join(tactics_parts) or _EMPTY_TACTICS
+
+    return _COMPETITOR_TACTICS_PAGE % (brand_name, tactics_html)
+
+
+# =============================================================================
+# NEW SECTION-BASED TEMPLATES (for 8-slide export)
+# =============================================================================
+
+_SCORE_CARD_PAGE = _page_template(_BASE_STYLES + _SCORECARD_STYLES, """\
+    <div class="container">
+        <div class="title">Audience Resonance Index Scorecard - %s</div>
+        <div class="kpi-grid">
+            <div class="kpi-box strength">
+                <div class="kpi-title">Top Strength</div>
+                <div class="kpi-value">%s</div>
             </div>
-        </body>
-        </html>
-        """
-
-    elif tab_name == "Advanced Metric Analysis":
-        metrics_html = ""
-        for metric_name, value in scores.items():
-            try:
-                if isinstance(value, (int, float)):
-                    name_str = str(metric_name) if not isinstance(metric_name, str) else metric_name
-                    display_name = name_str.replace('_', ' ').title()
-                    metrics_html += f"""
-                    <div class="metric-card">
-                        <div class="metric-name" style="font-size: 18px;">{display_name} - {value:.1f}</div>
-                        <div class="audience-desc">In-depth analysis of {display_name.lower()} score and recommendations for improvement.</div>
-                    </div>
-                    """
-            except Exception:
-                pass
-
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>{styles}
-        <style>
-            .audience-desc {{
-                font-size: 16px;
-                line-height: 1.6;
-                color: #475569;
-            }}
-        </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="title">Advanced Metric Analysis - {brand_name}</div>
-                {metrics_html if metrics_html else '<p>No metrics available for analysis.</p>'}
+            <div class="kpi-box opportunity">
+                <div class="kpi-title">Key Opportunity</div>
+                <div class="kpi-value">%s</div>
             </div>
-        </body>
-        </html>
-        """
-
-    elif tab_name == "Psychographic Highlights & Audience Summary":
-        audience_summary = session_state.get('audience_summary', {})
-        core = audience_summary.get('core_audience', 'Core audience not defined')
-        primary = audience_summary.get('primary_audience', 'Primary audience signal not defined')
-        secondary = audience_summary.get('secondary_audience', 'Secondary audience signal not defined')
-        psychographic = session_state.get('pychographic_highlights', 'Psychographic highlights not available')
-
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>{styles}
-        <style>
-            .audience-section {{
-                margin-bottom: 25px;
-                padding: 20px;
-                background: #f8fafc;
-                border-radius: 12px;
-                border-left: 4px solid #6171EA;
-            }}
-            .audience-title {{
-                font-size: 18px;
-                font-weight: 600;
-                color: #6171EA;
-                margin-bottom: 10px;
-            }}
-            .audience-desc {{
-                font-size: 16px;
-                line-height: 1.6;
-                color: #475569;
-            }}
-        </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="title">Psychographic Highlights & Audience Summary - {brand_name}</div>
-                <h3 style="color: #334155;">Psychographic Highlights</h3>
-                <div style="margin-bottom: 30px; font-size: 16px; line-height: 1.6;">{psychographic}</div>
-                <h3 style="color: #334155;">Audience Summary</h3>
-                <div class="audience-section">
-                    <div class="audience-title">Core Audience</div>
-                    <div class="audience-desc">{core}</div>
-                </div>
-                <div class="audience-section">
-                    <div class="audience-title">Primary Audience Signal</div>
-                    <div class="audience-desc">{primary}</div>
-                </div>
-                <div class="audience-section">
-                    <div class="audience-title">Secondary Audience Signal</div>
-                    <div class="audience-desc">{secondary}</div>
-                </div>
+            <div class="kpi-box roi">
+                <div class="kpi-title">KPI Potential</div>
+                <div class="kpi-value">%s</div>
             </div>
-        </body>
-        </html>
-        """
-
-    elif tab_name == "Growth Audience Insights":
-        audience_segments = session_state.get('audience_segments', {})
-        segments = audience_segments.get('segments', []) if isinstance(audience_segments, dict) else []
-
-        segments_html = ""
-        for i, segment in enumerate(segments[:2]):  # Primary and Secondary only
-            if isinstance(segment, dict):
-                name = segment.get('name', f'Segment {i+1}')
-                description = segment.get('description', 'Description not available')
-                label = "Primary" if i == 0 else "Secondary Growth"
-                color = "#10b981" if i == 0 else "#6366f1"
-                segments_html += f"""
-                <div class="segment-card" style="border-color: {color};">
-                    <div class="segment-label" style="background: {color};">{label}</div>
-                    <div class="segment-name">{name}</div>
-                    <div class="segment-desc">{description}</div>
-                </div>
-                """
-
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>{styles}
-        <style>
-            .segments-grid {{
-                display: grid;
-                grid-template-columns: repeat(2, 1fr);
-                gap: 30px;
-            }}
-            .segment-card {{
-                padding: 25px;
-                border-radius: 12px;
-                border: 2px solid;
-                background: white;
-            }}
-            .segment-label {{
-                display: inline-block;
-                color: white;
-                padding: 4px 12px;
-                border-radius: 20px;
-                font-size: 12px;
-                font-weight: 600;
-                margin-bottom: 15px;
-            }}
-            .segment-name {{
-                font-size: 20px;
-                font-weight: 700;
-                color: #1e293b;
-                margin-bottom: 12px;
-            }}
-            .segment-desc {{
-                font-size: 15px;
-                line-height: 1.6;
-                color: #475569;
-            }}
-        </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="title">Growth Audience Insights - {brand_name}</div>
-                <div class="segments-grid">
-                    {segments_html if segments_html else '<p>No audience segments available.</p>'}
-                </div>
+        </div>
+    </div>""")
+
+
+def _build_score_card(session_state: Dict[str, Any], scores: Dict[str, Any], brand_name: str) -> str:
+    """Score Card section: the three KPI boxes."""
+    # Score Card: Title + Radar summary + KPI boxes
+    ai_insights = session_state.get('ai_insights', {})
+    top_strength = ai_insights.get('top_strength', 'N/A') if isinstance(ai_insights, dict) else 'N/A'
+    key_opportunity = ai_insights.get('key_opportunity', 'N/A') if isinstance(ai_insights, dict) else 'N/A'
+    roi_potential = ai_insights.get('roi_potential', 'N/A') if isinstance(ai_insights, dict) else 'N/A'
+
+    return _SCORE_CARD_PAGE % (brand_name, _text(top_strength), _text(key_opportunity), _text(roi_potential))
+
+
+_EXECUTIVE_SUMMARY_PAGE = _page_template(_BASE_STYLES, """\
+    <div class="container">
+        <div class="title">Executive Summary & Detailed Metrics - %s</div>
+        <h3 style="color: #334155;">Executive Summary</h3>
+        <p style="font-size: 16px; line-height: 1.6; margin-bottom: 30px;">%s</p>
+        <h3 style="color: #334155;">Detailed Metrics</h3>
+        <div class="grid">
+            %s
+        </div>
+    </div>""")
+
+
+_SCORED_METRIC_CARD = '<div class="metric-card"><div class="metric-name">%s</div><div class="metric-bar"><div class="metric-fill" style="width: %s%%; background: %s;"></div></div><div class="metric-value" style="color: %s;">%.1f</div></div>'
+
+# Score color bands: below 6 red, 6 up to 8 amber, 8 and above green
+_COLOR_THRESHOLDS = (6, 8)
+_COLORS = ("#ef4444", "#f59e0b", "#10b981")
+
+
+def _build_executive_summary(session_state: Dict[str, Any], scores: Dict[str, Any], brand_name: str) -> str:
+    """Executive Summary & Detailed Metrics section: summary text plus color-coded metric bars."""
+    ai_insights = session_state.get('ai_insights', {})
+    summary = ai_insights.get('summary', 'Executive summary not available') if isinstance(ai_insights, dict) else 'Executive summary not available'
+
+    metrics_parts = []
+    for display_name, value in _numeric_scores(scores):
+        percentage = min(100, max(0, value * 10))
+        color = _COLORS[bisect_right(_COLOR_THRESHOLDS, value)]
+        metrics_parts.append(_SCORED_METRIC_CARD % (display_name, percentage, color, color, value))
+    metrics_html = ''.join(metrics_parts)
+
+    return _EXECUTIVE_SUMMARY_PAGE % (brand_name, _text(summary), metrics_html)
+
+
+_ADVANCED_METRICS_PAGE = _page_template(_BASE_STYLES + _DESC_STYLES, """\
+    <div class="container">
+        <div class="title">Advanced Metric Analysis - %s</div>
+        %s
+    </div>""")
+_EMPTY_METRICS = '<p>No metrics available for analysis.</p>'
+
+
+_ANALYSIS_CARD = '<div class="metric-card"><div class="metric-name" style="font-size: 18px;">%s - %.1f</div><div class="audience-desc">In-depth analysis of %s score and recommendations for improvement.</div></div>'
+
+
+def _build_advanced_metrics(session_state: Dict[str, Any], scores: Dict[str, Any], brand_name: str) -> str:
+    """Advanced Metric Analysis section: one analysis card per metric."""
+    metrics_html = ''.join([
+        _ANALYSIS_CARD % (display_name, value, display_name.lower())
+        for display_name, value in _numeric_scores(scores)
+    ]) or _EMPTY_METRICS
+
+    return _ADVANCED_METRICS_PAGE % (brand_name, metrics_html)
+
+
+_PSYCHOGRAPHIC_SUMMARY_PAGE = _page_template(_BASE_STYLES + _PSYCHOGRAPHIC_STYLES, """\
+    <div class="container">
+        <div class="title">Psychographic Highlights & Audience Summary - %s</div>
+        <h3 style="color: #334155;">Psychographic Highlights</h3>
+        <div style="margin-bottom: 30px; font-size: 16px; line-height: 1.6;">%s</div>
+        <h3 style="color: #334155;">Audience Summary</h3>
+        <div class="audience-section">
+            <div class="audience-title">Core Audience</div>
+            <div class="audience-desc">%s</div>
+        </div>
+        <div class="audience-section">
+            <div class="audience-title">Primary Audience Signal</div>
+            <div class="audience-desc">%s</div>
+        </div>
+        <div class="audience-section">
+            <div class="audience-title">Secondary Audience Signal</div>
+            <div class="audience-desc">%s</div>
+        </div>
+    </div>""")
+
+
+def _build_psychographic_summary(session_state: Dict[str, Any], scores: Dict[str, Any], brand_name: str) -> str:
+    """Psychographic Highlights & Audience Summary section."""
+    audience_summary = session_state.get('audience_summary', {})
+    core = audience_summary.get('core_audience', 'Core audience not defined')
+    primary = audience_summary.get('primary_audience', 'Primary audience signal not defined')
+    secondary = audience_summary.get('secondary_audience', 'Secondary audience signal not defined')
+    psychographic = session_state.get('pychographic_highlights', 'Psychographic highlights not available')
+
+    return _PSYCHOGRAPHIC_SUMMARY_PAGE % (
+        brand_name, _text(psychographic), _text(core), _text(primary), _text(secondary),
+    )
+
+
+_GROWTH_AUDIENCES_PAGE = _page_template(_BASE_STYLES + _SEGMENT_STYLES, """\
+    <div class="container">
+        <div class="title">Growth Audience Insights - %s</div>
+        <div class="segments-grid">
+            %s
+        </div>
+    </div>""")
+_EMPTY_SEGMENTS = '<p>No audience segments available.</p>'
+
+
+_SEGMENT_CARD = (
+    '<div class="segment-card" style="border-color: %s;"><div class="segment-label" style="background: %s;">%s</div>'
+    '<div class="segment-name">%s</div><div class="segment-desc">%s</div></div>'
+)
+
+
+def _build_growth_audiences(session_state: Dict[str, Any], scores: Dict[str, Any], brand_name: str) -> str:
+    """Growth Audience Insights section: the primary and secondary growth segments."""
+    audience_segments = session_state.get('audience_segments', {})
+    segments = audience_segments.get('segments', []) if isinstance(audience_segments, dict) else []
+
+    segments_parts = []
+    for i, segment in enumerate(segments[:2]):  # Primary and Secondary only
+        if isinstance(segment, dict):
+            name = _text(segment.get('name', f'Segment {i+1}'))
+            description = _text(segment.get('description', 'Description not available'))
+            label = "Primary" if i == 0 else "Secondary Growth"
+            color = "#10b981" if i == 0 else "#6366f1"
+            segments_parts.append(_SEGMENT_CARD % (color, color, label, name, description))
+    segments_html = ''.join(segments_parts) or _EMPTY_SEGMENTS
+
+    return _GROWTH_AUDIENCES_PAGE % (brand_name, segments_html)
+
+
+_EMERGING_AUDIENCE_PAGE = _page_template(_BASE_STYLES + _EMERGING_STYLES, """\
+    <div class="container">
+        <div class="title">Emerging Audience Opportunity - %s</div>
+        <div class="emerging-box">
+            <div class="emerging-title">%s</div>
+            <div class="emerging-desc">%s</div>
+            <div class="detail-section">
+                <h4>Demographics</h4>
+                %s
             </div>
-        </body>
-        </html>
-        """
-
-    elif tab_name == "Emerging Audience Opportunity":
-        audience_segments = session_state.get('audience_segments', {})
-        segments = audience_segments.get('segments', []) if isinstance(audience_segments, dict) else []
-        emerging = segments[-1] if segments else {}
-
-        name = emerging.get('name', 'Emerging Growth Segment') if isinstance(emerging, dict) else 'Emerging Growth Segment'
-        description = emerging.get('description', 'This audience segment shows high potential for growth.') if isinstance(emerging, dict) else 'This audience segment shows high potential for growth.'
-        targeting_params = emerging.get('targeting_params', {}) if isinstance(emerging, dict) else {}
-        interests = emerging.get('interest_categories', []) if isinstance(emerging, dict) else []
-
-        demographics_html = ""
-        if targeting_params:
-            demographics_html = f"""
-            <p><strong>Age:</strong> {targeting_params.get('age_range', 'N/A')}</p>
-            <p><strong>Gender:</strong> {targeting_params.get('gender_targeting', 'N/A')}</p>
-            <p><strong>Income:</strong> {targeting_params.get('income_targeting', 'N/A')}</p>
-            """
-
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>{styles}
-        <style>
-            .emerging-box {{
-                padding: 30px;
-                border-left: 4px solid #5865f2;
-                background: #f5f7ff;
-                border-radius: 12px;
-            }}
-            .emerging-title {{
-                font-size: 24px;
-                font-weight: 700;
-                color: #4338ca;
-                margin-bottom: 15px;
-            }}
-            .emerging-desc {{
-                font-size: 16px;
-                line-height: 1.6;
-                color: #475569;
-                font-style: italic;
-                margin-bottom: 20px;
-            }}
-            .detail-section {{
-                margin-top: 15px;
-            }}
-            .detail-section strong {{
-                color: #334155;
-            }}
-        </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="title">Emerging Audience Opportunity - {brand_name}</div>
-                <div class="emerging-box">
-                    <div class="emerging-title">{name}</div>
-                    <div class="emerging-desc">{description}</div>
-                    <div class="detail-section">
-                        <h4>Demographics</h4>
-                        {demographics_html if demographics_html else '<p>Demographics data not available</p>'}
-                    </div>
-                    <div class="detail-section">
-                        <h4>Key Interests</h4>
-                        <p>{', '.join(interests) if interests else 'Interests identified through AI pattern recognition'}</p>
-                    </div>
-                </div>
+            <div class="detail-section">
+                <h4>Key Interests</h4>
+                <p>%s</p>
             </div>
-        </body>
-        </html>
-        """
-
-    return None
+        </div>
+    </div>""")
+_DEMOGRAPHICS = (
+    '<p><strong>Age:</strong> %s</p><p><strong>Gender:</strong> %s</p>'
+    '<p><strong>Income:</strong> %s</p>'
+)
+_EMPTY_DEMOGRAPHICS = '<p>Demographics data not available</p>'
+
+
+def _build_emerging_audience(session_state: Dict[str, Any], scores: Dict[str, Any], brand_name: str) -> str:
+    """Emerging Audience Opportunity section: the last audience segment in detail."""
+    audience_segments = session_state.get('audience_segments', {})
+    segments = audience_segments.get('segments', []) if isinstance(audience_segments, dict) else []
+    emerging = segments[-1] if segments else {}
+
+    name = emerging.get('name', 'Emerging Growth Segment') if isinstance(emerging, dict) else 'Emerging Growth Segment'
+    description = emerging.get('description', 'This audience segment shows high potential for growth.') if isinstance(emerging, dict) else 'This audience segment shows high potential for growth.'
+    targeting_params = emerging.get('targeting_params', {}) if isinstance(emerging, dict) else {}
+    interests = emerging.get('interest_categories', []) if isinstance(emerging, dict) else []
+
+    demographics_html = _EMPTY_DEMOGRAPHICS
+    if targeting_params:
+        demographics_html = _DEMOGRAPHICS % (
+            _text(targeting_params.get('age_range', 'N/A')),
+            _text(targeting_params.get('gender_targeting', 'N/A')),
+            _text(targeting_params.get('income_targeting', 'N/A')),
+        )
+
+    return _EMERGING_AUDIENCE_PAGE % (
+        brand_name,
+        _text(name),
+        _text(description),
+        demographics_html,
+        escape(', '.join(interests)) if interests else 'Interests identified through AI pattern recognition',
+    )
+
+
+# HTML builder for each tab/section name
+_TAB_BUILDERS = {
+    "Detailed Metrics": _build_detailed_metrics,
+    "Audience Insights": _build_audience_insights,
+    "Media Affinities": _build_media_affinities,
+    "Trend Analysis": _build_trend_analysis,
+    "Next Steps": _build_next_steps,
+    "Competitor Tactics": _build_competitor_tactics,
+    "Score Card": _build_score_card,
+    "Executive Summary & Detailed Metrics": _build_executive_summary,
+    "Advanced Metric Analysis": _build_advanced_metrics,
+    "Psychographic Highlights & Audience Summary": _build_psychographic_summary,
+    "Growth Audience Insights": _build_growth_audiences,
+    "Emerging Audience Opportunity": _build_emerging_audience,
+}
 
 
 # Convenience function for direct use
@@ -2200,9 +2561,20 @@ def capture_streamlit_screenshots(
         logger.info("Using HTML rendering mode (no live app required)")
         screenshots = {}
         items_to_capture = sections if use_sections else tabs
-        for item_name in items_to_capture:
-            logger.info(f"Processing: {item_name}")
-            png_bytes = capture_tab_content_as_html(session_state, item_name)
+        scores, brand_name = _normalize_fallback_state(session_state)
+        signature = _fallback_signature(session_state)
+
+        # Render the items concurrently; each one's render still runs on the
+        # capture pool, so this never holds more browsers than that pool has
+        workers = max(1, min(SECTION_CAPTURE_WORKERS, len(items_to_capture)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="html-capture") as executor:
+            results = executor.map(
+                lambda item_name: _capture_tab_html(session_state, scores, brand_name, item_name, signature),
+                items_to_capture
+            )
+            rendered = list(zip(items_to_capture, results))
+
+        for item_name, png_bytes in rendered:
             if png_bytes:
                 screenshots[item_name] = png_bytes
                 logger.info(f"  ✓ Successfully captured {item_name}")
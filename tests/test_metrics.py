@@ -0,0 +1,40 @@
+"""Tests for core.services.metrics."""
+import pytest
+
+metrics = pytest.importorskip("core.services.metrics")
+
+from core.models.metrics import MetricsData
+
+
+def _metrics_data(**overrides):
+    fields = dict(
+        scores={name: 6.0 + i * 0.35 for i, name in enumerate(metrics.METRIC_NAMES)},
+        brief_text="Launch campaign for a streetwear brand",
+        improvement_areas=[],
+        ai_insights={'performance_prediction': "Expected ROI of 18% over baseline"},
+    )
+    fields.update(overrides)
+    return MetricsData(**fields)
+
+
+def test_process_metrics_reuses_cached_result():
+    metrics._process_metrics_cached.cache_clear()
+    service = metrics.MetricsService()
+
+    first = service.process_metrics(_metrics_data())
+    second = service.process_metrics(_metrics_data())
+
+    assert metrics._process_metrics_cached.cache_info().hits == 1
+    assert first == second
+    assert first.values is not second.values
+
+
+def test_rcc_score_without_brief_is_plain_average():
+    scores = {name: 0.1 * (i + 1) for i, name in enumerate(metrics.METRIC_NAMES)}
+    metrics._process_metrics_cached.cache_clear()
+
+    result = metrics.MetricsService().process_metrics(
+        _metrics_data(scores=scores, brief_text="", ai_insights=None)
+    )
+
+    assert result.rcc_score == sum(scores.values()) / len(scores)
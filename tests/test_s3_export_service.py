@@ -0,0 +1,101 @@
+"""Tests for core.s3_export_service."""
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+from core.s3_export_service import S3ExportService
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    """Answers 503 to the first request of each method and 200 after that."""
+
+    def _respond(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        self.server.calls.append(self.command)
+        if self.server.calls.count(self.command) == 1:
+            status, body = 503, b'{}'
+        else:
+            status, body = 200, b'{"url": "https://example.com/signed"}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_POST = do_PUT = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def flaky_server():
+    server = HTTPServer(('127.0.0.1', 0), _FlakyHandler)
+    server.calls = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _base_url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_upload_retries_503(flaky_server):
+    service = S3ExportService(api_base_url=_base_url(flaky_server))
+
+    assert service.upload_to_s3(f"{_base_url(flaky_server)}/exports/deck.pptx", b'pptx')
+    assert flaky_server.calls == ['PUT', 'PUT']
+
+
+def test_presigned_url_retries_503(flaky_server):
+    service = S3ExportService(api_base_url=_base_url(flaky_server))
+
+    url = service.get_presigned_upload_url('export-1', 'streamlit_complete')
+    assert url == "https://example.com/signed"
+    assert flaky_server.calls == ['POST', 'POST']
+
+
+def test_export_uploads_all_components_before_one_stitch(monkeypatch):
+    import core.s3_export_service as s3
+
+    monkeypatch.setattr(s3, 'EXPORT_AVAILABLE', True)
+    monkeypatch.setattr(s3, 'export_to_pptx', lambda **kwargs: b'deck', raising=False)
+
+    events = []
+    uploaded = {}
+
+    def upload_component(export_id, component_name, pptx_bytes):
+        uploaded[component_name] = pptx_bytes
+        events.append('upload')
+        return True
+
+    def invoke_stitch(export_id, components, slide_order=None):
+        events.append('stitch')
+        return {'downloadUrl': 'https://example.com/final.pptx', 'componentsIncluded': components}
+
+    service = S3ExportService()
+    monkeypatch.setattr(service, 'upload_component', upload_component)
+    monkeypatch.setattr(service, 'invoke_stitch', invoke_stitch)
+
+    result = service.export_and_stitch(
+        session_state={},
+        export_id='export-1',
+        components=['streamlit_complete'],
+        component_files={'cultural_moments': b'moments', 'consumer_journey': b'journey'},
+    )
+
+    assert result.success
+    assert uploaded == {
+        'streamlit_complete': b'deck',
+        'cultural_moments': b'moments',
+        'consumer_journey': b'journey',
+    }
+    assert events == ['upload', 'upload', 'upload', 'stitch']
+    assert result.components_included == ['streamlit_complete', 'cultural_moments', 'consumer_journey']
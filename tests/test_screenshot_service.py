@@ -0,0 +1,28 @@
+"""Tests for core.screenshot_service."""
+from core.screenshot_service import EXPORT_MODE_SCRIPT, _json_dumps, _prepare_component_html
+
+
+def test_export_script_goes_before_head_close():
+    html = '<!DOCTYPE html><html><head><title>t</title></head><body></body></html>'
+
+    assert _prepare_component_html(html, {}) == (
+        '<!DOCTYPE html><html><head><title>t</title>' + EXPORT_MODE_SCRIPT + '</head><body></body></html>'
+    )
+
+
+def test_headless_template_is_left_as_is():
+    html = '<div id="root"></div><script>render()</script>'
+
+    assert _prepare_component_html(html, {}) == html
+
+
+def test_placeholders_with_any_key_are_filled():
+    html = '<body>{{brand-name}} {{stats.total}} {{DATA}} {{unknown-key}} style={{ {{DATA}}</body>'
+
+    data = {'a': [1, 2]}
+
+    assert _prepare_component_html(html, {
+        'brand-name': 'Acme',
+        'stats.total': 12,
+        'DATA': data,
+    }) == f'<body>Acme 12 {_json_dumps(data)} {{{{unknown-key}}}} style={{{{ {_json_dumps(data)}</body>'